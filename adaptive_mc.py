@@ -0,0 +1,174 @@
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Callable, Mapping
+
+import numpy as np
+import polars as pl
+
+from payoffs import PathStats, price_payoffs
+
+
+def _quantile_label(q: float) -> str:
+    return f"p{q * 100:02g}"
+
+
+@dataclass
+class CellEstimate:
+    # Running estimate for one (regime, payoff) cell. Mean and variance are
+    # merged batch by batch; quantile intervals are distribution-free, read
+    # off the order statistics of every value drawn so far. The cell stops
+    # once every interval half-width is within max(atol, rtol * scale) or it
+    # has used max_paths, where scale is the larger of |estimate| and the
+    # cell's 5-95% range, so estimates near zero still have a finite target.
+    rtol: float = 0.02
+    atol: float = 0.0
+    quantiles: tuple[float, ...] = (0.05, 0.95)
+    confidence: float = 0.95
+    min_paths: int = 1_000
+    max_paths: int = 100_000
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    batches: list[np.ndarray] = field(default_factory=list, repr=False)
+    converged: bool = False
+    finished: bool = False
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.square(values - batch_mean).sum())
+        delta = batch_mean - self.mean
+        total = self.count + values.size
+        self.mean += delta * values.size / total
+        self.m2 += batch_m2 + delta**2 * self.count * values.size / total
+        self.count = total
+        self.batches.append(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        if len(self.batches) > 1:
+            self.batches = [np.concatenate(self.batches)]
+        return self.batches[0] if self.batches else np.empty(0)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float("nan")
+
+    @property
+    def z(self) -> float:
+        return NormalDist().inv_cdf(0.5 + self.confidence / 2)
+
+    def mean_half_width(self) -> float:
+        return self.z * self.std / math.sqrt(self.count) if self.count > 1 else float("inf")
+
+    def quantile_intervals(self) -> dict[float, tuple[float, float, float]]:
+        # (estimate, low, high) per quantile. The interval is the pair of
+        # order statistics whose ranks bracket n*q by z binomial standard
+        # deviations, so it holds whatever the payoff's distribution.
+        ordered = np.sort(self.values)
+        n = ordered.size
+        intervals = {}
+        for q in self.quantiles:
+            if n == 0:
+                intervals[q] = (float("nan"), -float("inf"), float("inf"))
+                continue
+            reach = self.z * math.sqrt(n * q * (1 - q))
+            lo = max(math.floor(n * q - reach), 0)
+            hi = min(math.ceil(n * q + reach), n - 1)
+            intervals[q] = (float(np.quantile(ordered, q)), float(ordered[lo]), float(ordered[hi]))
+        return intervals
+
+    def spread(self) -> float:
+        values = self.values
+        return float(np.subtract(*np.quantile(values, [0.95, 0.05]))) if values.size else float("nan")
+
+    def assess(self, batch_size: int) -> int:
+        # Update the stopping flags and return how many more paths this cell
+        # wants next: enough to close the widest interval if the 1/sqrt(n)
+        # rate holds, at least one batch and at most doubling the sample.
+        spread = self.spread()
+        widths = [(self.mean_half_width(), max(self.atol, self.rtol * max(abs(self.mean), spread)))]
+        for estimate, low, high in self.quantile_intervals().values():
+            widths.append(((high - low) / 2, max(self.atol, self.rtol * max(abs(estimate), spread))))
+        self.converged = self.count >= self.min_paths and all(width <= tol for width, tol in widths)
+        self.finished = self.converged or self.count >= self.max_paths
+        if self.finished:
+            return 0
+        ratio = max(width / tol if tol > 0 else float("inf") for width, tol in widths)
+        wanted = self.count * (ratio**2 - 1) if math.isfinite(ratio) else float("inf")
+        wanted = max(wanted, self.min_paths - self.count, batch_size)
+        return int(min(wanted, max(self.count, batch_size), self.max_paths - self.count))
+
+
+@dataclass
+class AdaptiveRun:
+    cells: dict[tuple[str, str], CellEstimate]
+
+    @property
+    def summary(self) -> pl.DataFrame:
+        # mc_summary's columns plus paths used, interval half-widths and
+        # whether the cell reached its precision target within budget.
+        rows = []
+        for (regime, payoff), cell in self.cells.items():
+            row = {"regime": regime, "payoff": payoff, "paths": cell.count, "mean": cell.mean, "std": cell.std}
+            row["mean_ci"] = cell.mean_half_width()
+            for q, (estimate, low, high) in cell.quantile_intervals().items():
+                row[_quantile_label(q)] = estimate
+                row[f"{_quantile_label(q)}_ci"] = (high - low) / 2
+            row["converged"] = cell.converged
+            rows.append(row)
+        return pl.DataFrame(rows)
+
+    @property
+    def samples(self) -> pl.DataFrame:
+        # Long frame in mc_df's layout plus the path id: one row per
+        # (regime, payoff, path). A cell that stopped early holds paths 0..n-1.
+        return pl.concat([
+            pl.DataFrame({"regime": regime, "payoff": payoff, "path": np.arange(cell.count), "total": cell.values})
+            for (regime, payoff), cell in self.cells.items()
+        ])
+
+
+def adaptive_monte_carlo(
+    samplers: Mapping[str, Callable[[slice], np.ndarray]],
+    payoffs: Mapping[str, Callable[[PathStats], np.ndarray]],
+    rtol: float = 0.02,
+    atol: float = 0.0,
+    quantiles: tuple[float, ...] = (0.05, 0.95),
+    confidence: float = 0.95,
+    batch_size: int = 250,
+    min_paths: int = 1_000,
+    max_paths: int = 100_000,
+) -> AdaptiveRun:
+    # `samplers` map a regime name to a function returning the (n, time)
+    # returns of the path ids in a slice, drawn in order from path 0 (keyed
+    # samplers from path_rng make any path reproducible on its own);
+    # `payoffs` are price_payoffs-style payoffs. Each round draws
+    # one batch per regime, sized for its least precise live cell, and prices
+    # only the payoffs still running, so easy cells stop early and the
+    # budget flows to the noisy ones (e.g. convex payoffs on fat tails).
+    cells = {
+        (regime, payoff): CellEstimate(rtol, atol, tuple(quantiles), confidence, min_paths, max_paths)
+        for regime in samplers
+        for payoff in payoffs
+    }
+    next_batch = dict.fromkeys(samplers, max(batch_size, 1))
+    drawn = dict.fromkeys(samplers, 0)
+    while next_batch:
+        for regime in list(next_batch):
+            live = {name: payoff for name, payoff in payoffs.items() if not cells[regime, name].finished}
+            paths = slice(drawn[regime], drawn[regime] + next_batch[regime])
+            drawn[regime] = paths.stop
+            values = price_payoffs(samplers[regime](paths), live)
+            wanted = []
+            for name in live:
+                cells[regime, name].update(values[name].to_numpy())
+                wanted.append(cells[regime, name].assess(batch_size))
+            if max(wanted) > 0:
+                next_batch[regime] = max(wanted)
+            else:
+                del next_batch[regime]
+    return AdaptiveRun(cells)
@@ -1,9 +1,8 @@
 from manim import *
-import random
 import numpy as np
 
-# Set seed for reproducibility across the whole scene
-random.seed(42)
+from galton_geometry import ALPHA, BALL_RADIUS, BASE, BETA, BIN_HEIGHT, DY, GRID_SIZE, LOG_START_Y, NORMAL_START_Y, PEG_RADIUS, ROWS, X_SCALE, ball_experiment
+from path_rng import path_generator
 
 class CombinedGaltonScene(Scene):
     def construct(self):
@@ -73,20 +72,18 @@ class CombinedGaltonScene(Scene):
         self.wait(2)
 
     def create_normal_board_objects(self):
-        GRID_SIZE = 0.35
-        ROWS = 12
-        START_Y = 3.0
+        START_Y = NORMAL_START_Y
         
         pegs = VGroup()
         for row in range(ROWS):
             for col in range(row + 1):
                 x = (col - row / 2) * GRID_SIZE
                 y = START_Y - row * GRID_SIZE
-                peg = Dot(point=[x, y, 0], radius=0.05, color=WHITE)
+                peg = Dot(point=[x, y, 0], radius=PEG_RADIUS, color=WHITE)
                 pegs.add(peg)
         
         bins = VGroup()
-        bin_height = 1.5
+        bin_height = BIN_HEIGHT
         bin_y_top = START_Y - ROWS * GRID_SIZE + GRID_SIZE / 2
         bin_y_bottom = bin_y_top - bin_height
         
@@ -101,11 +98,7 @@ class CombinedGaltonScene(Scene):
         return pegs, bins, floor
 
     def create_lognormal_board_objects(self):
-        ROWS = 12
-        BASE = 1.3
-        DY = 0.45
-        START_Y = 3.2
-        X_SCALE = 2.0
+        START_Y = LOG_START_Y
         
         def get_x(row, col):
             exponent = col - row / 2
@@ -120,7 +113,7 @@ class CombinedGaltonScene(Scene):
             for col in range(row + 1):
                 x = get_x(row, col)
                 y = START_Y - row * DY
-                peg = Dot(point=[x, y, 0], radius=0.05, color=WHITE)
+                peg = Dot(point=[x, y, 0], radius=PEG_RADIUS, color=WHITE)
                 pegs.add(peg)
         
         bins = VGroup()
@@ -149,14 +142,7 @@ class CombinedGaltonScene(Scene):
 
     def create_pareto_board_objects(self):
         # Same geometry as Lognormal
-        ROWS = 12
-        BASE = 1.3
-        DY = 0.45
-        START_Y = 3.2
-        X_SCALE = 2.0
-        
-        ALPHA = 1.0
-        BETA = 3.0
+        START_Y = LOG_START_Y
         
         def get_x(row, col):
             exponent = col - row / 2
@@ -206,21 +192,18 @@ class CombinedGaltonScene(Scene):
         return pegs, bins, floor
 
     def run_balls(self, distribution):
-        ROWS = 12
-        BALL_RADIUS = 0.06
         TOTAL_BALLS = 100
         
         # Determine constants based on current board state (approximated from pegs)
         # Actually we need the logic constants.
         # Normal:
-        NORM_GRID_SIZE = 0.35
-        NORM_START_Y = 3.0
+        NORM_GRID_SIZE = GRID_SIZE
+        NORM_START_Y = NORMAL_START_Y
         
         # Lognormal/Pareto:
-        LOG_BASE = 1.3
-        LOG_DY = 0.45
-        LOG_START_Y = 3.2
-        LOG_X_SCALE = 2.0
+        LOG_BASE = BASE
+        LOG_DY = DY
+        LOG_X_SCALE = X_SCALE
         
         def get_log_x(row, col):
             exponent = col - row / 2
@@ -239,7 +222,7 @@ class CombinedGaltonScene(Scene):
         # Color based on distribution
         color = BLUE if distribution == "normal" else (GREEN if distribution == "lognormal" else RED)
         
-        for _ in range(TOTAL_BALLS):
+        for ball_id in range(TOTAL_BALLS):
             # Start position
             if distribution == "normal":
                 start_pos = [0, NORM_START_Y + NORM_GRID_SIZE, 0]
@@ -251,6 +234,7 @@ class CombinedGaltonScene(Scene):
             
             path_points = [np.array(start_pos)]
             col_index = 0
+            turns = path_generator(ball_experiment(distribution), ball_id).random(ROWS)
             
             # Simulation
             if distribution == "normal":
@@ -258,7 +242,7 @@ class CombinedGaltonScene(Scene):
                 current_y = NORM_START_Y + NORM_GRID_SIZE
                 for row in range(ROWS):
                     current_y -= NORM_GRID_SIZE
-                    direction = random.choice([-1, 1])
+                    direction = 1 if turns[row] < 0.5 else -1
                     current_x += direction * NORM_GRID_SIZE / 2
                     if direction == 1: col_index += 1
                     path_points.append(np.array([current_x, current_y, 0]))
@@ -274,12 +258,10 @@ class CombinedGaltonScene(Scene):
                 
                 for row in range(ROWS):
                     if distribution == "lognormal":
-                        direction = random.choice([0, 1])
+                        direction = int(turns[row] < 0.5)
                     else: # Pareto
-                        ALPHA = 1.0
-                        BETA = 3.0
                         prob_right = (col_index + ALPHA) / (row + ALPHA + BETA)
-                        direction = 1 if random.random() < prob_right else 0
+                        direction = 1 if turns[row] < prob_right else 0
                         
                     if direction == 1: col_index += 1
                     target_x = get_log_x(row, col_index)
@@ -0,0 +1,112 @@
+import numpy as np
+
+# Points per drawn line; about two per horizontal pixel of a 12-inch figure at 120 dpi.
+MAX_POINTS = 2_000
+
+
+def minmax_envelope(values: np.ndarray, max_points: int = MAX_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    # (indices, values) keeping the lowest and highest point of each of
+    # max_points / 2 equal buckets, in time order. Every spike and trough
+    # survives, so the line covers the same pixels as the full series.
+    # NaNs are skipped; a bucket that is all NaN keeps one NaN as a gap.
+    values = np.asarray(values, dtype=float)
+    n = values.size
+    if n <= max_points:
+        return np.arange(n), values
+    width = -(-n // max(max_points // 2, 1))
+    buckets = np.full(-(-n // width) * width, np.nan)
+    buckets[:n] = values
+    buckets = buckets.reshape(-1, width)
+    empty = np.isnan(buckets).all(axis=1)
+    low = np.where(np.isnan(buckets), np.inf, buckets).argmin(axis=1)
+    high = np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1)
+    picks = np.sort(np.column_stack([low, high]), axis=1)
+    picks[empty] = 0
+    index = np.unique(np.minimum((picks + np.arange(buckets.shape[0])[:, None] * width).ravel(), n - 1))
+    return index, values[index]
+
+
+def lttb(values: np.ndarray, max_points: int = MAX_POINTS, x: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    # Largest-triangle-three-buckets: keeps the first and last points and, per
+    # bucket, the point forming the largest triangle with the previous pick
+    # and the next bucket's mean. Smoother than the envelope at the same
+    # budget while still keeping isolated shocks. Returns (indices, values).
+    values = np.asarray(values, dtype=float)
+    n = values.size
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    if n <= max_points or max_points < 3:
+        return np.arange(n), values
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    index = np.empty(max_points, dtype=np.int64)
+    index[0], index[-1] = 0, n - 1
+    previous = 0
+    for b in range(max_points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < edges.size:
+            next_lo, next_hi = edges[b + 1], edges[b + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        mean_x, mean_y = np.nanmean(x[next_lo:next_hi]), np.nanmean(values[next_lo:next_hi])
+        area = np.abs((x[previous] - mean_x) * (values[lo:hi] - values[previous]) - (x[previous] - x[lo:hi]) * (mean_y - values[previous]))
+        previous = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        index[b + 1] = previous
+    return index, values[index]
+
+
+def downsample(values: np.ndarray, max_points: int | None = MAX_POINTS, method: str = "minmax") -> tuple[np.ndarray, np.ndarray]:
+    # (indices, values) to hand to ax.plot; max_points=None draws everything.
+    values = np.asarray(values, dtype=float)
+    if max_points is None:
+        return np.arange(values.size), values
+    if method == "minmax":
+        return minmax_envelope(values, max_points)
+    if method == "lttb":
+        return lttb(values, max_points)
+    raise ValueError(f"Unknown method {method!r}; use 'minmax' or 'lttb'")
+
+
+def fan_bands(
+    paths: np.ndarray,
+    quantiles: tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    max_points: int = MAX_POINTS,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Cross-path quantiles of a (paths, time) array on at most max_points
+    # bucket midpoints. Quantiles below the median take each bucket's
+    # minimum and those above take its maximum, so bands only ever widen
+    # and a crash inside a bucket still shows. Returns (x, (quantiles, x)).
+    paths = np.asarray(paths, dtype=float)
+    # nanquantile is several times slower, so it is only used when needed.
+    bands = (np.quantile if np.isfinite(paths).all() else np.nanquantile)(paths, quantiles, axis=0)
+    n = bands.shape[1]
+    buckets = min(n, max_points)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    x = (edges[:-1] + edges[1:] - 1) / 2
+    reduced = np.empty((len(quantiles), buckets))
+    for i, q in enumerate(quantiles):
+        reduce = np.fmin if q < 0.5 else np.fmax
+        reduced[i] = reduce.reduceat(bands[i], edges[:-1]) if q != 0.5 else np.add.reduceat(bands[i], edges[:-1]) / np.diff(edges)
+    return x, reduced
+
+
+def fan_chart(
+    ax,
+    paths: np.ndarray,
+    quantiles: tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    max_points: int = MAX_POINTS,
+    x: np.ndarray | None = None,
+    color: str = "tab:blue",
+    label: str | None = None,
+):
+    # Nested bands between symmetric quantile pairs plus the median line,
+    # drawn from fan_bands so the artist count and size are fixed by
+    # max_points, not by the number of paths or bars. `x` maps bar numbers
+    # to the axis (e.g. dates), indexed at the bucket midpoints.
+    centres, bands = fan_bands(paths, quantiles, max_points)
+    xs = centres if x is None else np.asarray(x)[np.rint(centres).astype(np.int64)]
+    order = np.argsort(quantiles)
+    for depth in range(len(order) // 2):
+        lo, hi = order[depth], order[-1 - depth]
+        ax.fill_between(xs, bands[lo], bands[hi], color=color, alpha=0.15 + 0.15 * depth, linewidth=0)
+    if 0.5 in quantiles:
+        ax.plot(xs, bands[quantiles.index(0.5)], color=color, label=label)
+    return ax
@@ -0,0 +1,105 @@
+import numpy as np
+import polars as pl
+
+# Paths per block; a block of (paths, time) float64 temporaries stays around
+# a few hundred MB for 252-step paths.
+PATH_CHUNK = 65_536
+# Column types of drawdown_episodes, also used for the frame with no episodes.
+EPISODE_SCHEMA = {
+    "path": pl.Int64,
+    "start": pl.Int32,
+    "trough": pl.Int32,
+    "recovery": pl.Int32,
+    "depth": pl.Float64,
+    "duration": pl.Int32,
+    "time_under_water": pl.Int32,
+    "recovered": pl.Boolean,
+}
+
+
+def _episodes_block(returns: np.ndarray, path_offset: int) -> dict[str, np.ndarray]:
+    n_paths, n_steps = returns.shape
+    # Equity with the starting capital as the first peak, so a loss on bar 0
+    # already opens an episode.
+    equity = np.cumprod(1 + returns, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    drawdown = equity / peak - 1
+    under = drawdown < 0
+
+    prev = np.zeros_like(under)
+    prev[:, 1:] = under[:, :-1]
+    starts = under & ~prev
+
+    # Underwater bars of one episode are contiguous in row-major order and
+    # never cross paths (each row starts with prev=False), so a single
+    # compressed array plus reduceat covers every path at once.
+    flat_under = under.ravel()
+    dd = drawdown.ravel()[flat_under]
+    cells = np.flatnonzero(flat_under)
+    first = np.flatnonzero(starts.ravel()[flat_under])
+    if first.size == 0:
+        return {}
+    lengths = np.diff(np.append(first, dd.size))
+
+    depth = np.minimum.reduceat(dd, first)
+    # First position within each episode that hits its depth.
+    position = np.arange(dd.size)
+    at_depth = dd == np.repeat(depth, lengths)
+    trough_cell = cells[np.minimum.reduceat(np.where(at_depth, position, dd.size), first)]
+
+    start_cell = cells[first]
+    path = start_cell // n_steps
+    start = start_cell % n_steps
+    trough = trough_cell % n_steps
+    end = start + lengths
+    recovered = end < n_steps
+    return {
+        "path": (path + path_offset).astype(np.int64),
+        "start": start.astype(np.int32),
+        "trough": trough.astype(np.int32),
+        "recovery": np.where(recovered, end, -1).astype(np.int32),
+        "depth": depth,
+        "duration": (trough - start + 1).astype(np.int32),
+        "time_under_water": lengths.astype(np.int32),
+        "recovered": recovered,
+    }
+
+
+def drawdown_episodes(simple_returns: np.ndarray) -> pl.DataFrame:
+    # One row per drawdown episode across a (paths, time) return matrix (a 1-D
+    # series is one path). Bars are return indices: `start` is the first bar
+    # below the prior peak, `trough` the bar of the deepest point, `recovery`
+    # the first bar back at the peak (null if still underwater at the end).
+    # `duration` counts bars from peak to trough and `time_under_water` bars
+    # spent below the peak, censored at the horizon when not recovered.
+    returns = np.asarray(simple_returns, dtype=float)
+    if returns.ndim == 1:
+        returns = returns[None, :]
+    blocks = []
+    for lo in range(0, returns.shape[0], PATH_CHUNK):
+        block = _episodes_block(returns[lo:lo + PATH_CHUNK], lo)
+        if block:
+            blocks.append(block)
+    if not blocks:
+        return pl.DataFrame(schema=EPISODE_SCHEMA)
+    frame = pl.DataFrame({name: np.concatenate([block[name] for block in blocks]) for name in EPISODE_SCHEMA}, schema=EPISODE_SCHEMA)
+    return frame.with_columns(pl.when(pl.col("recovered")).then(pl.col("recovery")).alias("recovery"))
+
+
+def drawdown_summary(episodes: pl.DataFrame, quantiles: tuple[float, ...] = (0.5, 0.9, 0.99)) -> pl.DataFrame:
+    # Distribution of depth and durations over every episode, plus each
+    # path's worst episode (the per-path equivalent of "Max drawdown").
+    # Quantiles are taken on severity, so p99 is the deepest/longest 1%.
+    worst = episodes.group_by("path").agg(pl.col("depth").min())
+    rows = []
+    for name, column, sign in [
+        ("Depth", episodes["depth"], -1),
+        ("Worst depth per path", worst["depth"], -1),
+        ("Duration (bars)", episodes["duration"].cast(pl.Float64), 1),
+        ("Time under water (bars)", episodes["time_under_water"].cast(pl.Float64), 1),
+    ]:
+        row = {"metric": name, "mean": column.mean()}
+        for q in quantiles:
+            row[f"p{q * 100:g}"] = column.quantile(q if sign > 0 else 1 - q)
+        rows.append(row)
+    return pl.DataFrame(rows)
@@ -20,18 +20,99 @@ from manim import (
     Scene,
     Text,
     Transform,
+    UpdateFromAlphaFunc,
     VGroup,
     VMobject,
     Write,
     rush_into,
 )
 
-# random seed for reproducibility
-np.random.seed(42)
+from presentation_artifacts import load_or_default
+
+# Paths drawn per fan; the artifact file may hold more.
+FAN_PATHS = 300
+
+
+def axis_range(lo: float, hi: float, ticks: int = 4) -> list[float]:
+    # [min, max, step] covering lo..hi with a round tick step.
+    span = max(hi - lo, 1e-12)
+    magnitude = 10 ** math.floor(math.log10(span / ticks))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if span / (m * magnitude) <= ticks)
+    return [math.floor(lo / step) * step, math.ceil(hi / step) * step, step]
+
+
+def to_points(axes: Axes, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    # Axes coordinates to scene points in one affine transform; broadcasts x
+    # against y and returns shape (..., 3).
+    origin = np.asarray(axes.c2p(0, 0))
+    x_unit = np.asarray(axes.c2p(1, 0)) - origin
+    y_unit = np.asarray(axes.c2p(0, 1)) - origin
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    return origin + x[..., None] * x_unit + y[..., None] * y_unit
+
+
+def polyline(axes: Axes, x: np.ndarray, y: np.ndarray, color, stroke_width: float = 4) -> VMobject:
+    line = VMobject(stroke_color=color, stroke_width=stroke_width)
+    line.set_points_as_corners(to_points(axes, x, y))
+    return line
+
+
+def path_fan(axes: Axes, x: np.ndarray, paths: np.ndarray, color, stroke_opacity: float = 0.08, stroke_width: float = 1) -> VMobject:
+    # Every path of a (paths, steps) array as one subpath of a single
+    # VMobject, so hundreds of paths cost one mobject to build, style and
+    # render.
+    corners = to_points(axes, x, paths)
+    start, end = corners[:, :-1], corners[:, 1:]
+    # Straight segments as cubic Beziers: anchors plus handles at thirds.
+    curves = np.stack([start, start + (end - start) / 3, start + 2 * (end - start) / 3, end], axis=2)
+    fan = VMobject(stroke_color=color, stroke_opacity=stroke_opacity, stroke_width=stroke_width)
+    fan.set_points(curves.reshape(-1, 3))
+    return fan
+
+
+def grow_fan(fan: VMobject, n_paths: int, **kwargs) -> UpdateFromAlphaFunc:
+    # Reveal every path of a path_fan together, step by step. (Create would
+    # draw the subpaths one after another.)
+    curves = fan.points.copy().reshape(n_paths, -1, 4, 3)
+
+    def update(mobject: VMobject, alpha: float) -> None:
+        shown = max(1, math.ceil(alpha * curves.shape[1]))
+        mobject.set_points(curves[:, :shown].reshape(-1, 3))
+
+    return UpdateFromAlphaFunc(fan, update, **kwargs)
+
+
+def price_axes_for(prices: np.ndarray) -> tuple[Axes, np.ndarray]:
+    # Axes sized to the central 98% of every path's levels; paths are
+    # clipped to that box so a single blow-up cannot squash the fan.
+    lo, hi = np.quantile(prices, [0.01, 0.99])
+    y_range = axis_range(lo, hi)
+    n_steps = prices.shape[1] - 1
+    axes = (
+        Axes(
+            x_range=axis_range(0, n_steps),
+            y_range=y_range,
+            x_length=6,
+            y_length=3,
+            axis_config={"include_tip": False},
+        )
+        .to_edge(RIGHT)
+        .shift(DOWN * 0.5)
+    )
+    return axes, np.clip(prices, y_range[0], y_range[1])
 
 
 class FatTailsPresentation(Scene):
     def construct(self):
+        # Simulation outputs exported by the notebook (see presentation_artifacts);
+        # without an export, the same experiments are drawn from keyed generators.
+        artifacts = load_or_default()
+        gaussian_prices = artifacts.gaussian_prices[:FAN_PATHS]
+        fat_prices = artifacts.fat_tailed_prices[:FAN_PATHS]
+        steps = np.arange(gaussian_prices.shape[1])
+        grid = artifacts.return_grid
+        density_top = max(artifacts.gaussian_density.max(), artifacts.fat_tailed_density.max())
+
         # --- Part 1: The Gaussian Illusion ---
 
         # Title
@@ -43,8 +124,8 @@ class FatTailsPresentation(Scene):
         # Axes for distribution
         axes = (
             Axes(
-                x_range=[-4, 4, 1],
-                y_range=[0, 0.5, 0.1],
+                x_range=axis_range(grid[0], grid[-1]),
+                y_range=axis_range(0, density_top),
                 x_length=6,
                 y_length=3,
                 axis_config={"include_tip": False},
@@ -53,15 +134,12 @@ class FatTailsPresentation(Scene):
             .shift(DOWN * 0.5)
         )
 
-        # axes_labels = axes.get_axis_labels(x_label="Return", y_label="Prob")
         x_label = Text("Return", font_size=24).next_to(axes.x_axis, RIGHT)
         y_label = Text("Prob", font_size=24).next_to(axes.y_axis, UP)
         axes_labels = VGroup(x_label, y_label)
 
-        # Gaussian Curve
-        gaussian = axes.plot(
-            lambda x: (1 / (math.sqrt(2 * math.pi))) * math.exp(-0.5 * x**2), color=BLUE
-        )
+        # Gaussian density of the simulated returns
+        gaussian = polyline(axes, grid, artifacts.gaussian_density, BLUE)
         gaussian_label = Text("Gaussian", color=BLUE, font_size=24).next_to(
             gaussian, UP
         )
@@ -70,42 +148,18 @@ class FatTailsPresentation(Scene):
         self.play(Create(gaussian), Write(gaussian_label))
         self.wait(1)
 
-        # Simulating a Gaussian Price Path
-        # 100 steps
-        n_steps = 100
-        gaussian_returns = np.random.normal(0.05, 0.5, n_steps)  # Slight drift up
-        gaussian_prices = np.cumsum(gaussian_returns)
-
-        # Axes for Price
-        price_axes = (
-            Axes(
-                x_range=[0, n_steps, 20],
-                y_range=[-5, 15, 5],
-                x_length=6,
-                y_length=3,
-                axis_config={"include_tip": False},
-            )
-            .to_edge(RIGHT)
-            .shift(DOWN * 0.5)
-        )
-
-        # price_labels = price_axes.get_axis_labels(x_label="Time", y_label="Price")
+        # Every simulated Gaussian price path as one fan, with the median-outcome path on top
+        price_axes, gaussian_clipped = price_axes_for(gaussian_prices)
         p_x_label = Text("Time", font_size=24).next_to(price_axes.x_axis, RIGHT)
         p_y_label = Text("Price", font_size=24).next_to(price_axes.y_axis, UP)
         price_labels = VGroup(p_x_label, p_y_label)
 
-        # Plotting the path
-        # We create points for the path
-        points = [price_axes.c2p(0, 0)]
-        for i in range(1, n_steps):
-            points.append(price_axes.c2p(i, gaussian_prices[i]))
-
-        price_path = VMobject()
-        price_path.set_points_as_corners(points)
-        price_path.set_color(GREEN)
+        gaussian_fan = path_fan(price_axes, steps, gaussian_clipped, GREEN)
+        median_path = np.argsort(gaussian_prices[:, -1])[len(gaussian_prices) // 2]
+        price_path = polyline(price_axes, steps, gaussian_clipped[median_path], GREEN, stroke_width=3)
 
         self.play(Create(price_axes), Write(price_labels))
-        self.play(Create(price_path, run_time=3))
+        self.play(grow_fan(gaussian_fan, len(gaussian_prices), run_time=3), Create(price_path, run_time=3))
 
         # Result text
         result_text = Text("Steady Growth", color=GREEN, font_size=36).next_to(
@@ -122,6 +176,7 @@ class FatTailsPresentation(Scene):
             FadeOut(gaussian_label),
             FadeOut(price_axes),
             FadeOut(price_labels),
+            FadeOut(gaussian_fan),
             FadeOut(price_path),
             FadeOut(result_text),
             FadeOut(title),
@@ -135,23 +190,19 @@ class FatTailsPresentation(Scene):
 
         # Axes again (same setup)
         axes2 = (
-            Axes(x_range=[-6, 6, 2], y_range=[0, 0.5, 0.1], x_length=6, y_length=3)
+            Axes(
+                x_range=axis_range(grid[0], grid[-1]),
+                y_range=axis_range(0, density_top),
+                x_length=6,
+                y_length=3,
+            )
             .to_edge(LEFT)
             .shift(DOWN * 0.5)
         )
 
-        # Gaussian (Ghost)
-        gaussian_ghost = axes2.plot(
-            lambda x: (1 / (math.sqrt(2 * math.pi))) * math.exp(-0.5 * x**2),
-            color=BLUE,
-            fill_opacity=0,
-        )
-
-        # Fat Tail (Cauchy/Student-t proxy)
-        # Using Cauchy for dramatic effect: 1 / (pi * (1 + x^2))
-        fat_tail = axes2.plot(
-            lambda x: 1 / (math.pi * (1 + (x / 0.5) ** 2)) * 0.5, color=RED
-        )
+        # Gaussian (Ghost) morphing into the fat-tailed returns' density
+        gaussian_ghost = polyline(axes2, grid, artifacts.gaussian_density, BLUE)
+        fat_tail = polyline(axes2, grid, artifacts.fat_tailed_density, RED)
         fat_tail_label = Text("Fat Tailed", color=RED, font_size=24).next_to(
             fat_tail, UP
         )
@@ -161,34 +212,13 @@ class FatTailsPresentation(Scene):
         self.play(Transform(gaussian_ghost, fat_tail), Write(fat_tail_label))
         self.wait(1)
 
-        # Simulating Fat Tail Price Path
-        # Mixture of Gaussian + occasional large shocks
-        fat_returns = np.random.normal(0.05, 0.5, n_steps)
-        # Add shocks
-        shock_indices = np.random.choice(n_steps, 5, replace=False)
-        fat_returns[shock_indices] -= np.random.uniform(3, 6, 5)  # Massive drops
-
-        fat_prices = np.cumsum(fat_returns)
-
-        # Axes for Price
-        price_axes2 = (
-            Axes(
-                x_range=[0, n_steps, 20], y_range=[-20, 10, 10], x_length=6, y_length=3
-            )
-            .to_edge(RIGHT)
-            .shift(DOWN * 0.5)
-        )
-
-        points2 = [price_axes2.c2p(0, 0)]
-        for i in range(1, n_steps):
-            points2.append(price_axes2.c2p(i, fat_prices[i]))
-
-        price_path2 = VMobject()
-        price_path2.set_points_as_corners(points2)
-        price_path2.set_color(RED)
+        # Fat-tailed price paths, with the worst outcome highlighted
+        price_axes2, fat_clipped = price_axes_for(fat_prices)
+        fat_fan = path_fan(price_axes2, steps, fat_clipped, RED)
+        price_path2 = polyline(price_axes2, steps, fat_clipped[np.argmin(fat_prices[:, -1])], RED, stroke_width=3)
 
         self.play(Create(price_axes2))
-        self.play(Create(price_path2, run_time=3))
+        self.play(grow_fan(fat_fan, len(fat_prices), run_time=3), Create(price_path2, run_time=3))
 
         crash_text = Text("CRASH", color=RED, font_size=36).next_to(price_axes2, DOWN)
         self.play(Write(crash_text))
@@ -200,6 +230,7 @@ class FatTailsPresentation(Scene):
             FadeOut(fat_tail),
             FadeOut(fat_tail_label),
             FadeOut(price_axes2),
+            FadeOut(fat_fan),
             FadeOut(price_path2),
             FadeOut(crash_text),
             FadeOut(title2),
@@ -211,43 +242,31 @@ class FatTailsPresentation(Scene):
         self.play(Write(title3))
         self.play(title3.animate.to_edge(UP))
 
-        # Axes
+        # Axes over the exported move grid and payoff values
+        moves = artifacts.move_grid
+        convex, concave = artifacts.convex_payoff, artifacts.concave_payoff
         payoff_axes = Axes(
-            x_range=[-3, 3, 1],
-            y_range=[-2, 4, 1],
+            x_range=axis_range(moves[0], moves[-1]),
+            y_range=axis_range(min(convex.min(), concave.min()), max(convex.max(), concave.max())),
             x_length=8,
             y_length=5,
             axis_config={"include_tip": True},
         ).shift(DOWN * 0.5)
 
-        # labels = payoff_axes.get_axis_labels(x_label="Market Move", y_label="Profit/Loss")
         pay_x_label = Text("Market Move", font_size=24).next_to(
             payoff_axes.x_axis, RIGHT
         )
         pay_y_label = Text("Profit/Loss", font_size=24).next_to(payoff_axes.y_axis, UP)
         labels = VGroup(pay_x_label, pay_y_label)
 
-        # Concave Curve (Selling Volatility)
-        # e.g. y = 1 - e^(-x) is bounded? Let's use -x^2 shifted or something simpler to visualize
-        # The blog uses: Concave = 1 - exp(-4x) (for x>0?), Convex = exp(4x) - 1
-        # Let's stick to the visual concept:
-        # Concave: Small gains usually, huge loss on big moves.
-        # Convex: Small losses usually, huge gain on big moves.
-
-        # Let's use simple exponentials for visual clarity over the range [-2, 2]
-        # Convex: y = x^2 (if long straddle) or e^x
-        # Let's use the blog's idea roughly.
-
-        convex_curve = payoff_axes.plot(
-            lambda x: 0.5 * (math.exp(x) - 1), x_range=[-2, 2.5], color=GREEN
-        )
+        # Convex: small losses usually, big gains on big moves.
+        # Concave: small gains usually, big losses on big moves.
+        convex_curve = polyline(payoff_axes, moves, convex, GREEN)
         convex_label = Text("Convex (Antifragile)", color=GREEN, font_size=24).next_to(
             convex_curve, UP
         )
 
-        concave_curve = payoff_axes.plot(
-            lambda x: 0.5 * (1 - math.exp(x)), x_range=[-2, 2.5], color=RED
-        )
+        concave_curve = polyline(payoff_axes, moves, concave, RED)
         concave_label = Text("Concave (Fragile)", color=RED, font_size=24).next_to(
             concave_curve, DOWN
         )
@@ -256,30 +275,33 @@ class FatTailsPresentation(Scene):
         self.play(Create(convex_curve), Write(convex_label))
         self.play(Create(concave_curve), Write(concave_label))
 
-        # Animate a "Black Swan" event
-        # A dot moves far to the right (large market move)
+        # Animate a "Black Swan" event: a one-sigma day, then the tail crash from the simulation
+        def on_curves(move: float) -> tuple[np.ndarray, np.ndarray]:
+            return (
+                to_points(payoff_axes, move, np.interp(move, moves, convex)),
+                to_points(payoff_axes, move, np.interp(move, moves, concave)),
+            )
 
-        dot_convex = Dot(color=GREEN).move_to(payoff_axes.c2p(0, 0))
-        dot_concave = Dot(color=RED).move_to(payoff_axes.c2p(0, 0))
+        start_convex, start_concave = on_curves(0.0)
+        dot_convex = Dot(color=GREEN).move_to(start_convex)
+        dot_concave = Dot(color=RED).move_to(start_concave)
 
         self.play(FadeIn(dot_convex), FadeIn(dot_concave))
 
         # Move normal
+        normal_convex, normal_concave = on_curves(artifacts.normal_move)
         self.play(
-            dot_convex.animate.move_to(payoff_axes.c2p(0.5, 0.5 * (math.exp(0.5) - 1))),
-            dot_concave.animate.move_to(
-                payoff_axes.c2p(0.5, 0.5 * (1 - math.exp(0.5)))
-            ),
+            dot_convex.animate.move_to(normal_convex),
+            dot_concave.animate.move_to(normal_concave),
             run_time=1,
         )
         self.wait(0.5)
 
         # Move Extreme
+        extreme_convex, extreme_concave = on_curves(artifacts.extreme_move)
         self.play(
-            dot_convex.animate.move_to(payoff_axes.c2p(2.2, 0.5 * (math.exp(2.2) - 1))),
-            dot_concave.animate.move_to(
-                payoff_axes.c2p(2.2, 0.5 * (1 - math.exp(2.2)))
-            ),
+            dot_convex.animate.move_to(extreme_convex),
+            dot_concave.animate.move_to(extreme_concave),
             run_time=1.5,
             rate_func=rush_into,
         )
@@ -1,16 +1,13 @@
 from manim import *
-import random
 import numpy as np
 
-random.seed(42)
+from galton_geometry import BALL_RADIUS, BIN_HEIGHT, FALL_TIME, GRID_SIZE, NORMAL_START_Y, PEG_RADIUS, ROWS, ball_experiment
+from path_rng import path_generator
 
 class GaltonBoard(Scene):
     def construct(self):
         # Constants
-        GRID_SIZE = 0.35  # Reduced from 0.5 to fit
-        ROWS = 12
         COLS = 12
-        BALL_RADIUS = 0.06 # Reduced radius
         TOTAL_BALLS = 50 # Increased balls slightly since they are smaller
         ANIMATION_SPEED = 0.5
 
@@ -24,7 +21,7 @@ class GaltonBoard(Scene):
         # 12 * 0.35 = 4.2
         # Bin height = 1.5
         # Total = 5.7. Fits easily.
-        start_y = 3.0
+        start_y = NORMAL_START_Y
         
         # Create Pegs
         pegs = VGroup()
@@ -33,14 +30,14 @@ class GaltonBoard(Scene):
                 # Triangular arrangement
                 x = (col - row / 2) * GRID_SIZE
                 y = start_y - row * GRID_SIZE
-                peg = Dot(point=[x, y, 0], radius=0.05, color=WHITE)
+                peg = Dot(point=[x, y, 0], radius=PEG_RADIUS, color=WHITE)
                 pegs.add(peg)
         
         self.add(pegs)
 
         # Create Bins
         bins = VGroup()
-        bin_height = 1.5
+        bin_height = BIN_HEIGHT
         bin_y_top = start_y - ROWS * GRID_SIZE + GRID_SIZE / 2
         bin_y_bottom = bin_y_top - bin_height
         
@@ -77,7 +74,7 @@ class GaltonBoard(Scene):
 
         animations = []
         
-        for _ in range(TOTAL_BALLS):
+        for ball_id in range(TOTAL_BALLS):
             ball = make_ball()
             balls.add(ball)
             
@@ -85,6 +82,7 @@ class GaltonBoard(Scene):
             current_x = 0
             current_y = start_y + GRID_SIZE
             path_points = [np.array([current_x, current_y, 0])]
+            turns = path_generator(ball_experiment("normal"), ball_id).random(ROWS)
             
             # Fall through pegs
             col_index = 0
@@ -93,7 +91,7 @@ class GaltonBoard(Scene):
                 current_y -= GRID_SIZE
                 
                 # Randomly go left or right
-                direction = random.choice([-1, 1]) # -1 left, 1 right
+                direction = 1 if turns[row] < 0.5 else -1 # -1 left, 1 right
                 # Actually in triangular grid, it's more like:
                 # current x is shifted by +/- GRID_SIZE / 2
                 
@@ -131,7 +129,7 @@ class GaltonBoard(Scene):
             
             # Animate move along path
             # run_time needs to be fast
-            anim = MoveAlongPath(ball, path, run_time=2.0, rate_func=linear)
+            anim = MoveAlongPath(ball, path, run_time=FALL_TIME, rate_func=linear)
             animations.append(anim)
 
         # Play animations
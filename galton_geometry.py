@@ -0,0 +1,29 @@
+# Board geometry shared by the manim scenes (galton_board.py,
+# lognormal_galton_board.py, pareto_galton_board.py, combined_galton_scene.py)
+# and the raster renderer (galton_raster.py), so their videos stay in step.
+ROWS = 12
+# Normal board: pegs GRID_SIZE apart in both directions.
+GRID_SIZE = 0.35
+NORMAL_START_Y = 3.0
+# Multiplicative (lognormal/Pareto) boards: peg x is BASE ** exponent,
+# re-centred and scaled by X_SCALE, with rows DY apart.
+BASE = 1.3
+DY = 0.45
+LOG_START_Y = 3.2
+X_SCALE = 2.0
+# Polya urn weights of the Pareto board.
+ALPHA = 1.0
+BETA = 3.0
+BIN_HEIGHT = 1.5
+PEG_RADIUS = 0.05
+BALL_RADIUS = 0.06
+# Seconds for one ball to fall through the board.
+FALL_TIME = 2.0
+
+
+def ball_experiment(kind: str) -> str:
+    # path_rng experiment for a board's balls: ball i draws its turns from
+    # path_generator(ball_experiment(kind), i).random(ROWS) and goes right
+    # where a draw is below the peg's right-turn probability, so every scene
+    # and the raster renderer drop the same balls.
+    return f"galton-{kind}"
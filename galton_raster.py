@@ -0,0 +1,331 @@
+import argparse
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from galton_geometry import (
+    ALPHA,
+    BALL_RADIUS,
+    BASE,
+    BETA,
+    BIN_HEIGHT,
+    DY,
+    FALL_TIME,
+    GRID_SIZE,
+    LOG_START_Y,
+    NORMAL_START_Y,
+    PEG_RADIUS,
+    ROWS,
+    X_SCALE,
+    ball_experiment,
+)
+from path_rng import draw_paths
+
+# manim's default camera frame (scene units) and palette.
+FRAME_HEIGHT = 8.0
+FRAME_WIDTH = FRAME_HEIGHT * 16 / 9
+BACKGROUND = (0, 0, 0)
+WHITE = (255, 255, 255)
+GRAY = (136, 136, 136)
+BLUE = (88, 196, 221)
+GREEN = (131, 193, 103)
+RED = (252, 98, 85)
+BALL_COLORS = {"normal": BLUE, "lognormal": GREEN, "pareto": RED}
+
+
+@dataclass(frozen=True)
+class Board:
+    # Geometry of one manim board. Horizontal positions are a function of the
+    # "exponent" col - row / 2: linear for the normal board, BASE ** exponent
+    # (re-centred and scaled) for the multiplicative boards.
+    kind: str = "normal"
+    rows: int = ROWS
+
+    def __post_init__(self):
+        if self.kind not in BALL_COLORS:
+            raise ValueError(f"Unknown board {self.kind!r}; use 'normal', 'lognormal' or 'pareto'")
+
+    @property
+    def dy(self) -> float:
+        return GRID_SIZE if self.kind == "normal" else DY
+
+    @property
+    def start_y(self) -> float:
+        return NORMAL_START_Y if self.kind == "normal" else LOG_START_Y
+
+    @property
+    def bin_top(self) -> float:
+        return self.start_y - self.rows * self.dy + self.dy / 2
+
+    @property
+    def bin_bottom(self) -> float:
+        return self.bin_top - BIN_HEIGHT
+
+    def x(self, exponent) -> np.ndarray:
+        exponent = np.asarray(exponent, dtype=float)
+        if self.kind == "normal":
+            return exponent * GRID_SIZE
+        mid = (BASE ** (-self.rows / 2) + BASE ** (self.rows / 2)) / 2
+        return (BASE**exponent - mid) * X_SCALE
+
+    def pegs(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (x, y, probability of a right turn) for every peg.
+        row, col = np.tril_indices(self.rows)
+        return self.x(col - row / 2), self.start_y - row * self.dy, self.right_probability(row, col)
+
+    def dividers(self) -> np.ndarray:
+        return self.x(np.arange(self.rows + 2) - self.rows / 2 - 0.5)
+
+    def right_probability(self, row, col) -> np.ndarray:
+        # Pareto boards are a Polya urn: each right turn makes the next likelier.
+        if self.kind == "pareto":
+            return (np.asarray(col) + ALPHA) / (np.asarray(row) + ALPHA + BETA)
+        return np.full(np.shape(row), 0.5)
+
+
+@dataclass
+class GaltonRun:
+    # Precomputed balls: `waypoints` (balls, rows + 2, 2) holds the drop
+    # point, one point per peg row and the resting point on top of the
+    # ball's stack; `bins` is each ball's landing bin.
+    board: Board
+    waypoints: np.ndarray
+    bins: np.ndarray
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.bincount(self.bins, minlength=self.board.rows + 1)
+
+    @property
+    def stack_scale(self) -> float:
+        # Bin heights are normalised so the fullest bin just fills the bins.
+        return BIN_HEIGHT / max(int(self.counts.max()), 1)
+
+
+def simulate_board(board: Board, n_balls: int, experiment: str | None = None) -> GaltonRun:
+    # Ball i turns on path i of `experiment` (default ball_experiment(kind)),
+    # so it falls exactly as ball i of the manim scene for the same board.
+    rows = board.rows
+    turns = draw_paths(experiment or ball_experiment(board.kind), n_balls, lambda generator: generator.random(rows))
+    if board.kind == "pareto":
+        cols = np.empty((n_balls, rows), dtype=np.int16)
+        rights = np.zeros(n_balls, dtype=np.int16)
+        for row in range(rows):
+            rights += turns[:, row] < board.right_probability(row, rights)
+            cols[:, row] = rights
+    else:
+        cols = np.cumsum(turns < 0.5, axis=1, dtype=np.int16)
+    bins = cols[:, -1].astype(np.intp)
+
+    waypoints = np.empty((n_balls, rows + 2, 2), dtype=np.float32)
+    waypoints[:, 0] = board.x(0.0), board.start_y + board.dy
+    # After the turn at row r the ball sits between the pegs of row r + 1.
+    waypoints[:, 1:-1, 0] = board.x(cols - (np.arange(rows) + 1) / 2)
+    waypoints[:, 1:-1, 1] = board.start_y - np.arange(rows) * board.dy
+    waypoints[:, -1, 0] = board.x(bins - rows / 2)
+
+    # Each ball rests on the stack already in its bin when it was dropped.
+    order = np.argsort(bins, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(np.bincount(bins, minlength=rows + 1))[:-1]])
+    depth = np.empty(n_balls, dtype=np.int64)
+    depth[order] = np.arange(n_balls) - starts[bins[order]]
+    run = GaltonRun(board, waypoints, bins)
+    waypoints[:, -1, 1] = board.bin_bottom + depth * run.stack_scale
+    return run
+
+
+class Canvas:
+    # Maps scene units to pixels on a (height, width, 3) uint8 buffer.
+    def __init__(self, width: int = 1280, height: int = 720):
+        if width % 2 or height % 2:
+            raise ValueError("Frame width and height must be even for yuv420p video")
+        self.width = width
+        self.height = height
+        self.scale = min(width / FRAME_WIDTH, height / FRAME_HEIGHT)
+
+    def to_pixels(self, x, y) -> tuple[np.ndarray, np.ndarray]:
+        px = np.rint(np.asarray(x) * self.scale + self.width / 2).astype(np.intp)
+        py = np.rint(self.height / 2 - np.asarray(y) * self.scale).astype(np.intp)
+        return px, py
+
+    def blank(self) -> np.ndarray:
+        frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        frame[:] = BACKGROUND
+        return frame
+
+    def discs(self, frame: np.ndarray, x, y, radius: float, colors) -> None:
+        # Stamp one filled disc per centre; `colors` is one RGB triple or one per disc.
+        r = max(int(round(radius * self.scale)), 1)
+        oy, ox = np.mgrid[-r:r + 1, -r:r + 1]
+        inside = ox**2 + oy**2 <= r * r + r
+        ox, oy = ox[inside], oy[inside]
+        px, py = self.to_pixels(x, y)
+        xs = (px[:, None] + ox).ravel()
+        ys = (py[:, None] + oy).ravel()
+        keep = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        colors = np.asarray(colors, dtype=np.uint8)
+        if colors.ndim == 2:
+            colors = np.repeat(colors, ox.size, axis=0)[keep]
+        frame[ys[keep], xs[keep]] = colors
+
+    def rect(self, frame: np.ndarray, x0: float, x1: float, y0: float, y1: float, color) -> None:
+        px, py = self.to_pixels([x0, x1], [y0, y1])
+        left, right = np.clip(np.sort(px), 0, self.width)
+        top, bottom = np.clip(np.sort(py), 0, self.height)
+        frame[top:bottom, left:right] = color
+
+
+def draw_board(canvas: Canvas, board: Board) -> np.ndarray:
+    # Static layer (pegs, bin dividers, floor), drawn once per video.
+    frame = canvas.blank()
+    line = max(canvas.scale * 0.02, 1.0) / canvas.scale
+    dividers = board.dividers()
+    for x in dividers:
+        canvas.rect(frame, x - line / 2, x + line / 2, board.bin_bottom, board.bin_top, GRAY)
+    canvas.rect(frame, dividers[0], dividers[-1] + line / 2, board.bin_bottom - line, board.bin_bottom, GRAY)
+    x, y, p = board.pegs()
+    if board.kind == "pareto":
+        # Pegs tinted from blue (left bias) to red (right bias), as in the combined scene.
+        colors = np.rint(np.outer(1 - p, BLUE) + np.outer(p, RED))
+    else:
+        colors = WHITE
+    canvas.discs(frame, x, y, PEG_RADIUS, colors)
+    return frame
+
+
+def render_frames(
+    run: GaltonRun,
+    canvas: Canvas | None = None,
+    fps: int = 30,
+    drop_seconds: float = 60.0,
+    fall_time: float = FALL_TIME,
+    hold_seconds: float = 2.0,
+) -> Iterator[np.ndarray]:
+    # Balls are released evenly over `drop_seconds`, each taking `fall_time`
+    # to reach its stack; landed balls are drawn as per-bin bars rather than
+    # individually. Only the balls in flight are touched on each frame.
+    canvas = canvas or Canvas()
+    board = run.board
+    static = draw_board(canvas, board)
+    color = BALL_COLORS[board.kind]
+    n_balls = run.bins.size
+    segments = run.waypoints.shape[1] - 1
+    launch = np.arange(n_balls) * (drop_seconds / max(n_balls, 1))
+    landed_at = launch + fall_time
+    dividers = board.dividers()
+    counts = np.zeros(board.rows + 1, dtype=np.int64)
+    landed = 0
+
+    n_frames = int(np.ceil((drop_seconds + fall_time + hold_seconds) * fps))
+    for index in range(n_frames):
+        t = index / fps
+        frame = static.copy()
+
+        now_landed = int(np.searchsorted(landed_at, t, side="right"))
+        counts += np.bincount(run.bins[landed:now_landed], minlength=board.rows + 1)
+        landed = now_landed
+        for b in np.flatnonzero(counts):
+            left, right = dividers[b], dividers[b + 1]
+            inset = 0.15 * (right - left)
+            canvas.rect(frame, left + inset, right - inset, board.bin_bottom, board.bin_bottom + counts[b] * run.stack_scale, color)
+
+        in_flight = slice(landed, int(np.searchsorted(launch, t, side="right")))
+        if in_flight.stop > in_flight.start:
+            progress = (t - launch[in_flight]) / fall_time * segments
+            segment = np.minimum(progress.astype(np.intp), segments - 1)
+            frac = (progress - segment)[:, None]
+            points = run.waypoints[in_flight]
+            rows = np.arange(points.shape[0])
+            position = points[rows, segment] * (1 - frac) + points[rows, segment + 1] * frac
+            canvas.discs(frame, position[:, 0], position[:, 1], BALL_RADIUS, color)
+        yield frame
+
+
+def write_video(frames: Iterable[np.ndarray], path: str | Path, fps: int = 30, codec: str = "libx264", crf: int = 20) -> Path:
+    # Frames are encoded with PyAV (installed with manim) on a separate
+    # thread, so drawing the next frames overlaps with encoding.
+    import av
+
+    path = Path(path)
+    pending: queue.Queue = queue.Queue(maxsize=16)
+    done = object()
+
+    def encode() -> None:
+        with av.open(str(path), mode="w") as container:
+            stream = None
+            while (frame := pending.get()) is not done:
+                if stream is None:
+                    stream = container.add_stream(codec, rate=fps, options={"crf": str(crf)})
+                    stream.height, stream.width = frame.shape[:2]
+                    stream.pix_fmt = "yuv420p"
+                container.mux(stream.encode(av.VideoFrame.from_ndarray(frame, format="rgb24")))
+            if stream is not None:
+                container.mux(stream.encode())
+
+    errors: list[BaseException] = []
+
+    def worker() -> None:
+        try:
+            encode()
+        except BaseException as exc:
+            errors.append(exc)
+            # Unblock the producer.
+            while pending.get() is not done:
+                pass
+
+    thread = threading.Thread(target=worker, name="galton-encoder", daemon=True)
+    thread.start()
+    try:
+        for frame in frames:
+            if errors:
+                break
+            pending.put(frame)
+    finally:
+        pending.put(done)
+        thread.join()
+    if errors:
+        raise errors[0]
+    return path
+
+
+def render_board(
+    kind: str,
+    n_balls: int,
+    path: str | Path,
+    experiment: str | None = None,
+    width: int = 1280,
+    height: int = 720,
+    fps: int = 30,
+    drop_seconds: float = 60.0,
+) -> Path:
+    run = simulate_board(Board(kind), n_balls, experiment=experiment)
+    frames = render_frames(run, Canvas(width, height), fps=fps, drop_seconds=drop_seconds)
+    return write_video(frames, path, fps=fps)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a large Galton board straight to video.")
+    parser.add_argument("kind", choices=list(BALL_COLORS))
+    parser.add_argument("--balls", type=int, default=100_000)
+    parser.add_argument("--experiment", default=None, help="path_rng experiment name (default galton-KIND)")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--drop-seconds", type=float, default=60.0)
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args()
+    output = render_board(
+        args.kind,
+        args.balls,
+        args.output or f"{args.kind}_galton_{args.balls}.mp4",
+        experiment=args.experiment,
+        width=args.width,
+        height=args.height,
+        fps=args.fps,
+        drop_seconds=args.drop_seconds,
+    )
+    print(f"Wrote {output}")
@@ -0,0 +1,159 @@
+import math
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from path_rng import _path_ids, path_generator
+
+# Bytes per float64 (paths, time) array in a chunk; a chunk holds about four
+# (innovations, jumps, returns, volatility).
+MAX_CHUNK_BYTES = 256 * 2**20
+# Same Pareto tail as inject_shocks.
+JUMP_TAIL_INDEX = 3.0
+
+
+@dataclass(frozen=True)
+class GJRGarch:
+    # h[t+1] = omega + (alpha + gamma * 1[e[t] < 0]) * e[t]^2 + beta * h[t]
+    # Defaults: 1% long-run daily vol, persistence 0.98, bad news weighs 3x.
+    omega: float = 2e-6
+    alpha: float = 0.05
+    gamma: float = 0.10
+    beta: float = 0.88
+    mu: float = 0.0
+    df: float = 5.0
+    shock_probability: float = 0.0
+    shock_scale: float = 0.0
+
+    def __post_init__(self):
+        if self.alpha + self.gamma / 2 + self.beta >= 1:
+            raise ValueError(f"Non-stationary GJR-GARCH: alpha + gamma / 2 + beta = {self.alpha + self.gamma / 2 + self.beta:.4f} >= 1")
+
+    @property
+    def long_run_variance(self) -> float:
+        return self.omega / (1 - self.alpha - self.gamma / 2 - self.beta)
+
+    def next_variance(self, variance: np.ndarray, shock: np.ndarray, vol: np.ndarray) -> np.ndarray:
+        squared = np.square(shock)
+        variance *= self.beta
+        variance += self.omega + self.alpha * squared
+        variance += self.gamma * np.where(shock < 0, squared, 0.0)
+        return variance
+
+
+@dataclass(frozen=True)
+class EGarch:
+    # log h[t+1] = omega + alpha * (|z[t]| - E|z|) + gamma * z[t] + beta * log h[t]
+    # with z = e / sqrt(h). Defaults: 1% long-run daily vol, negative
+    # returns raise vol (gamma < 0), persistence 0.98.
+    omega: float = -0.184
+    alpha: float = 0.12
+    gamma: float = -0.08
+    beta: float = 0.98
+    mu: float = 0.0
+    df: float = 5.0
+    shock_probability: float = 0.0
+    shock_scale: float = 0.0
+
+    def __post_init__(self):
+        if not abs(self.beta) < 1:
+            raise ValueError(f"Non-stationary EGARCH: |beta| = {abs(self.beta)} >= 1")
+
+    @property
+    def long_run_variance(self) -> float:
+        # exp of the long-run mean of log h; paths start here.
+        return math.exp(self.omega / (1 - self.beta))
+
+    @property
+    def mean_abs_innovation(self) -> float:
+        # E|z| for the unit-variance Student-t.
+        df = self.df
+        return math.sqrt((df - 2) / math.pi) * math.exp(math.lgamma((df - 1) / 2) - math.lgamma(df / 2))
+
+    def next_variance(self, variance: np.ndarray, shock: np.ndarray, vol: np.ndarray) -> np.ndarray:
+        z = shock / vol
+        log_variance = self.omega + self.alpha * (np.abs(z) - self.mean_abs_innovation) + self.gamma * z
+        log_variance += self.beta * np.log(variance)
+        return np.exp(log_variance, out=variance)
+
+
+GarchModel = GJRGarch | EGarch
+
+
+def _draws(model: GarchModel, generator: np.random.Generator, n: int, n_steps: int) -> tuple[np.ndarray, np.ndarray]:
+    # Unit-variance Student-t innovations and inject_shocks-style jumps.
+    if model.df <= 2:
+        raise ValueError(f"Student-t innovations need df > 2 for a finite variance, got {model.df}")
+    innovations = generator.standard_t(model.df, (n, n_steps)) * math.sqrt((model.df - 2) / model.df)
+    jumps = np.zeros((n, n_steps))
+    if model.shock_probability > 0:
+        hit = generator.random((n, n_steps)) < model.shock_probability
+        jumps[hit] = generator.pareto(JUMP_TAIL_INDEX, hit.sum()) * model.shock_scale
+    return innovations, jumps
+
+
+def _recurse(model: GarchModel, innovations: np.ndarray, jumps: np.ndarray, burn_in: int) -> tuple[np.ndarray, np.ndarray]:
+    # One vectorized step per bar across every path, in time-major layout so
+    # each step reads and writes contiguous rows. Jumps are part of the
+    # shock, so a crash raises the next bar's variance like any bad day.
+    innovations, jumps = np.ascontiguousarray(innovations.T), np.ascontiguousarray(jumps.T)
+    n_steps, n = innovations.shape
+    returns = np.empty((n_steps - burn_in, n))
+    vols = np.empty((n_steps - burn_in, n))
+    variance = np.full(n, model.long_run_variance)
+    vol = np.empty(n)
+    shock = np.empty(n)
+    for t in range(n_steps):
+        np.sqrt(variance, out=vol)
+        np.multiply(vol, innovations[t], out=shock)
+        shock -= jumps[t]
+        if t >= burn_in:
+            vols[t - burn_in] = vol
+            np.add(shock, model.mu, out=returns[t - burn_in])
+        variance = model.next_variance(variance, shock, vol)
+    return np.ascontiguousarray(returns.T), np.ascontiguousarray(vols.T)
+
+
+def garch_chunks(
+    model: GarchModel,
+    paths: int | slice | Iterable[int],
+    n_steps: int,
+    burn_in: int = 0,
+    chunk_paths: int | None = None,
+    generator: np.random.Generator | None = None,
+    experiment: str | int | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    # Yield (path_ids, returns, volatility), both (chunk, n_steps), with
+    # volatility the conditional sd of each bar's return before any jump.
+    # Paths start at the long-run variance; burn_in extra bars are simulated
+    # and dropped first. Keying with `experiment` works as in
+    # CorrelatedUniverse.chunks: each path draws from its own generator.
+    total = n_steps + burn_in
+    chunk_paths = chunk_paths or max(1, MAX_CHUNK_BYTES // (8 * total))
+    path_ids = np.fromiter(_path_ids(paths), dtype=np.int64)
+    if experiment is None:
+        generator = generator or np.random.default_rng()
+    for lo in range(0, path_ids.size, chunk_paths):
+        ids = path_ids[lo:lo + chunk_paths]
+        if experiment is None:
+            innovations, jumps = _draws(model, generator, ids.size, total)
+        else:
+            rows = [_draws(model, path_generator(experiment, int(path_id)), 1, total) for path_id in ids]
+            innovations, jumps = (np.concatenate(parts) for parts in zip(*rows))
+        yield ids, *_recurse(model, innovations, jumps, burn_in)
+
+
+def simulate_garch(
+    model: GarchModel,
+    paths: int | slice | Iterable[int],
+    n_steps: int,
+    burn_in: int = 0,
+    chunk_paths: int | None = None,
+    generator: np.random.Generator | None = None,
+    experiment: str | int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    # (returns, volatility) for every requested path as (paths, n_steps)
+    # arrays; use garch_chunks to reduce block by block instead.
+    blocks = list(garch_chunks(model, paths, n_steps, burn_in, chunk_paths, generator, experiment))
+    return np.concatenate([b[1] for b in blocks]), np.concatenate([b[2] for b in blocks])
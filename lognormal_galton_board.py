@@ -1,19 +1,16 @@
 from manim import *
-import random
 import numpy as np
 
-random.seed(2)
+from galton_geometry import BALL_RADIUS, BASE, BIN_HEIGHT, DY, FALL_TIME, LOG_START_Y, PEG_RADIUS, ROWS, X_SCALE, ball_experiment
+from path_rng import path_generator
 
 class LognormalGaltonBoard(Scene):
     def construct(self):
         # Constants
-        ROWS = 12
         COLS = 12
-        BALL_RADIUS = 0.06
         TOTAL_BALLS = 50
         
         # Lognormal specific constants
-        BASE = 1.3  # The multiplicative factor
         # We want the board to be roughly centered.
         # The middle column corresponds to BASE^0 = 1.
         # We will shift everything by x_offset to center it on screen (x=0).
@@ -29,9 +26,7 @@ class LognormalGaltonBoard(Scene):
         # Let's just center the visual bounding box of the pegs.
         
         # Vertical spacing
-        DY = 0.45 # Reduced from 0.5 to fit vertically
-        START_Y = 3.2 # Shifted up slightly
-        X_SCALE = 2.0 # Increased to widen, but not too much
+        START_Y = LOG_START_Y
         
         # Helper to get x position
         def get_x(row, col):
@@ -60,14 +55,14 @@ class LognormalGaltonBoard(Scene):
             for col in range(row + 1):
                 x = get_x(row, col)
                 y = START_Y - row * DY
-                peg = Dot(point=[x, y, 0], radius=0.05, color=WHITE)
+                peg = Dot(point=[x, y, 0], radius=PEG_RADIUS, color=WHITE)
                 pegs.add(peg)
         
         self.add(pegs)
 
         # Create Bins
         bins = VGroup()
-        bin_height = 1.5
+        bin_height = BIN_HEIGHT
         bin_y_top = START_Y - ROWS * DY + DY / 2
         bin_y_bottom = bin_y_top - bin_height
         
@@ -145,7 +140,7 @@ class LognormalGaltonBoard(Scene):
 
         animations = []
         
-        for _ in range(TOTAL_BALLS):
+        for ball_id in range(TOTAL_BALLS):
             ball = make_ball()
             balls.add(ball)
             
@@ -159,6 +154,7 @@ class LognormalGaltonBoard(Scene):
             current_y = START_Y + DY
             
             path_points = [np.array([current_x, current_y, 0])]
+            turns = path_generator(ball_experiment("lognormal"), ball_id).random(ROWS)
             
             # Fall through pegs
             for row in range(ROWS):
@@ -172,7 +168,7 @@ class LognormalGaltonBoard(Scene):
                 # At row `r`, ball is at `col`.
                 # It chooses to go to `col` or `col+1` in row `r+1`.
                 
-                direction = random.choice([0, 1]) # 0 for left (same col index roughly?), 1 for right
+                direction = int(turns[row] < 0.5) # 0 for left (same col index roughly?), 1 for right
                 # Wait, in triangular grid:
                 # (row, col) -> (row+1, col) [Left]
                 # (row, col) -> (row+1, col+1) [Right]
@@ -215,7 +211,7 @@ class LognormalGaltonBoard(Scene):
             path = VMobject()
             path.set_points_as_corners(path_points)
             
-            anim = MoveAlongPath(ball, path, run_time=2.0, rate_func=linear)
+            anim = MoveAlongPath(ball, path, run_time=FALL_TIME, rate_func=linear)
             animations.append(anim)
 
         self.play(LaggedStart(*animations, lag_ratio=0.1, run_time=TOTAL_BALLS * 0.2 + 2))
@@ -0,0 +1,316 @@
+import asyncio
+import bisect
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Mapping
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+YAHOO_CHART_URL = "https://query2.finance.yahoo.com"
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(RuntimeError):
+    def __init__(self, symbol: str, message: str):
+        super().__init__(f"{symbol}: {message}")
+        self.symbol = symbol
+
+
+class RateLimiter:
+    # Token bucket shared by every request in a fetch.
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ConnectionPool:
+    # Bounded set of keep-alive connections to one host. Requests run on a
+    # matching thread pool so at most `size` round trips are in flight.
+    def __init__(self, base_url: str, size: int = 8, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.size = size
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="market-data")
+        self.idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self.idle.put_nowait(None)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _roundtrip(self, conn: http.client.HTTPConnection | None, path: str) -> tuple[http.client.HTTPConnection, int, bytes]:
+        conn = conn or self._connect()
+        try:
+            conn.request("GET", self.prefix + path, headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"})
+            response = conn.getresponse()
+            return conn, response.status, response.read()
+        except BaseException:
+            conn.close()
+            raise
+
+    async def get(self, path: str) -> tuple[int, bytes]:
+        conn = await self.idle.get()
+        try:
+            loop = asyncio.get_running_loop()
+            conn, status, body = await loop.run_in_executor(self.executor, self._roundtrip, conn, path)
+        except BaseException:
+            self.idle.put_nowait(None)
+            raise
+        self.idle.put_nowait(conn)
+        return status, body
+
+    def close(self) -> None:
+        while not self.idle.empty():
+            conn = self.idle.get_nowait()
+            if conn is not None:
+                conn.close()
+        self.executor.shutdown(wait=False)
+
+
+def _epoch(date: str | pd.Timestamp | None) -> int:
+    stamp = pd.Timestamp.now(tz="UTC") if date is None else pd.Timestamp(date)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize("UTC")
+    return int(stamp.timestamp())
+
+
+def chart_to_history(payload: dict, symbol: str) -> pd.DataFrame:
+    # Same schema as fetch_history: auto-adjusted OHLCV on a tz-naive daily index,
+    # float prices and int64 volume.
+    chart = payload.get("chart") or {}
+    if chart.get("error") or not chart.get("result"):
+        raise FetchError(symbol, str(chart.get("error") or "empty chart response"))
+    result = chart["result"][0]
+    timestamps = result.get("timestamp") or []
+    quote_block = result["indicators"]["quote"][0]
+    frame = pd.DataFrame(
+        {column: np.asarray(quote_block.get(column.lower(), [None] * len(timestamps)), dtype=float) for column in OHLCV},
+        index=pd.to_datetime(timestamps, unit="s", utc=True),
+    )
+    adjclose = result["indicators"].get("adjclose")
+    if adjclose:
+        ratio = np.asarray(adjclose[0]["adjclose"], dtype=float) / frame["Close"].to_numpy()
+        for column in ["Open", "High", "Low", "Close"]:
+            frame[column] = frame[column].to_numpy() * ratio
+    tz = result.get("meta", {}).get("exchangeTimezoneName", "UTC")
+    frame.index = frame.index.tz_convert(tz).normalize().tz_localize(None)
+    frame.index.name = "Date"
+    frame = frame.loc[:, OHLCV].dropna()
+    frame = frame[~frame.index.duplicated(keep="last")].astype({"Volume": np.int64})
+    # yf.download names the column level "Price" and reports integer volume.
+    frame.columns.name = "Price"
+    return frame
+
+
+def history_to_chart(history: pd.DataFrame, symbol: str) -> dict:
+    index = pd.DatetimeIndex(history.index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return {
+        "chart": {
+            "result": [{
+                "meta": {"symbol": symbol, "exchangeTimezoneName": "UTC", "dataGranularity": "1d"},
+                "timestamp": [int(ts.timestamp()) for ts in index],
+                "indicators": {
+                    "quote": [{column.lower(): history[column].astype(float).tolist() for column in OHLCV}],
+                    "adjclose": [{"adjclose": history["Close"].astype(float).tolist()}],
+                },
+            }],
+            "error": None,
+        }
+    }
+
+
+async def _fetch_one(pool: ConnectionPool, limiter: RateLimiter, symbol: str, start, end, max_retries: int, backoff: float) -> pd.DataFrame:
+    query = urlencode({"period1": _epoch(start), "period2": _epoch(end), "interval": "1d", "events": "div,splits", "includeAdjustedClose": "true"})
+    path = f"/v8/finance/chart/{quote(symbol, safe='')}?{query}"
+    for attempt in range(max_retries + 1):
+        await limiter.acquire()
+        try:
+            status, body = await pool.get(path)
+        except (OSError, http.client.HTTPException) as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            if status == 200:
+                return chart_to_history(json.loads(body), symbol)
+            if status not in RETRY_STATUSES:
+                raise FetchError(symbol, f"HTTP {status}: {body[:200].decode(errors='replace')}")
+            error = f"HTTP {status}"
+        if attempt < max_retries:
+            await asyncio.sleep(backoff * 2**attempt * (1 + random.random()))
+    raise FetchError(symbol, f"gave up after {max_retries + 1} attempts ({error})")
+
+
+async def fetch_histories_async(
+    symbols: Iterable[str],
+    start: str | Mapping[str, str],
+    end: str | None = None,
+    base_url: str = YAHOO_CHART_URL,
+    max_connections: int = 8,
+    requests_per_second: float = 10.0,
+    max_retries: int = 3,
+    backoff: float = 0.5,
+    timeout: float = 30.0,
+    errors: str = "raise",
+) -> dict[str, pd.DataFrame]:
+    symbols = list(dict.fromkeys(symbols))
+    starts = start if isinstance(start, Mapping) else dict.fromkeys(symbols, start)
+    pool = ConnectionPool(base_url, size=max_connections, timeout=timeout)
+    limiter = RateLimiter(requests_per_second, burst=max_connections)
+    try:
+        results = await asyncio.gather(
+            *(_fetch_one(pool, limiter, symbol, starts[symbol], end, max_retries, backoff) for symbol in symbols),
+            return_exceptions=True,
+        )
+    finally:
+        pool.close()
+
+    histories = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, BaseException):
+            if errors == "raise" or not isinstance(result, (FetchError, OSError, http.client.HTTPException)):
+                raise result
+            print(f"Skipping {symbol}: {result}")
+            continue
+        histories[symbol] = result
+    return histories
+
+
+def fetch_histories(symbols: Iterable[str], start: str | Mapping[str, str], **kwargs) -> dict[str, pd.DataFrame]:
+    # Jupyter already runs an event loop, so fall back to a helper thread there.
+    coroutine = fetch_histories_async(symbols, start, **kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def record_histories(histories: Mapping[str, pd.DataFrame], directory: str | Path) -> Path:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for symbol, history in histories.items():
+        (directory / f"{symbol}.json").write_text(json.dumps(history_to_chart(history, symbol)))
+    return directory
+
+
+class RecordedCandleServer:
+    # Local stand-in for the chart endpoint that replays recorded candles
+    # (a directory of <symbol>.json files or in-memory frames), honouring
+    # period1/period2. `latency` and `fail_every` simulate a slow, flaky API.
+    def __init__(self, candles: str | Path | Mapping[str, pd.DataFrame], latency: float = 0.0, fail_every: int = 0, port: int = 0):
+        if isinstance(candles, Mapping):
+            self.charts = {symbol: history_to_chart(frame, symbol) for symbol, frame in candles.items()}
+        else:
+            self.charts = {path.stem: json.loads(path.read_text()) for path in Path(candles).glob("*.json")}
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _slice(self, symbol: str, period1: int, period2: int) -> dict | None:
+        chart = self.charts.get(symbol)
+        if chart is None:
+            return None
+        result = chart["chart"]["result"][0]
+        timestamps = result["timestamp"]
+        lo, hi = bisect.bisect_left(timestamps, period1), bisect.bisect_left(timestamps, period2)
+        indicators = {
+            name: [{field: values[lo:hi] for field, values in block[0].items()}]
+            for name, block in result["indicators"].items()
+        }
+        return {"chart": {"result": [{**result, "timestamp": timestamps[lo:hi], "indicators": indicators}], "error": None}}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    count = server.requests
+                if server.latency:
+                    time.sleep(server.latency)
+                if server.fail_every and count % server.fail_every == 0:
+                    self._send(503, {"chart": {"result": None, "error": {"code": "Unavailable"}}})
+                    return
+                parts = urlsplit(self.path)
+                # The client escapes symbols such as ^GSPC (%5EGSPC).
+                symbol = unquote(parts.path.rsplit("/", 1)[-1])
+                query = parse_qs(parts.query)
+                period1 = int(query.get("period1", ["0"])[0])
+                period2 = int(query.get("period2", [str(2**62)])[0])
+                payload = server._slice(symbol, period1, period2)
+                if payload is None:
+                    self._send(404, {"chart": {"result": None, "error": {"code": "Not Found", "description": f"No data found for {symbol}"}}})
+                else:
+                    self._send(200, payload)
+
+        return Handler
+
+    def start(self) -> "RecordedCandleServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "RecordedCandleServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
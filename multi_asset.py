@@ -0,0 +1,121 @@
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from path_rng import _path_ids, path_generator
+
+# Bytes of float64 output per chunk; peak memory is about three times this
+# (normal draws and their correlated transform live alongside the output).
+MAX_CHUNK_BYTES = 256 * 2**20
+# Same Pareto tail as inject_shocks.
+JUMP_TAIL_INDEX = 3.0
+
+
+def _factor(correlation: np.ndarray) -> np.ndarray:
+    # Cholesky factor of the correlation matrix. Estimated or hand-edited
+    # matrices are often slightly indefinite, so those are first clipped to
+    # the nearest positive semi-definite matrix with a unit diagonal.
+    try:
+        return np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(correlation)
+        clipped = (vectors * np.maximum(values, 1e-10)) @ vectors.T
+        scale = np.sqrt(np.diag(clipped))
+        return np.linalg.cholesky(clipped / np.outer(scale, scale))
+
+
+class CorrelatedUniverse:
+    # Multivariate Student-t returns for a fixed set of assets. Each regime
+    # (anything with Regime's fields: length, mu, sigma, df, shock_probability,
+    # shock_scale; mu and sigma may be per-asset arrays) draws
+    #   r = mu + sigma * L z / sqrt(w / df) - beta * J
+    # where L is the Cholesky factor, z ~ N(0, I), w ~ chi2(df) is shared by all
+    # assets on a bar, and J is a Pareto jump hitting every asset on the same
+    # bar with loading beta. Marginals are sigma * t_df, as in
+    # student_t_returns, and the shared w gives the t-copula's tail
+    # dependence: when one asset has an extreme day, the others tend to too.
+    # L is computed once here and reused by every regime and chunk.
+    def __init__(self, correlation: np.ndarray, jump_beta: float | np.ndarray = 1.0):
+        correlation = np.asarray(correlation, dtype=float)
+        if correlation.ndim != 2 or correlation.shape[0] != correlation.shape[1]:
+            raise ValueError(f"Correlation matrix must be square, got shape {correlation.shape}")
+        if not np.allclose(correlation, correlation.T) or not np.allclose(np.diag(correlation), 1.0):
+            raise ValueError("Correlation matrix must be symmetric with a unit diagonal")
+        self.correlation = correlation
+        self.n_assets = correlation.shape[0]
+        self.factor = _factor(correlation)
+        self.jump_beta = np.broadcast_to(np.asarray(jump_beta, dtype=float), (self.n_assets,))
+
+    @classmethod
+    def equicorrelated(cls, n_assets: int, rho: float, jump_beta: float | np.ndarray = 1.0) -> "CorrelatedUniverse":
+        correlation = np.full((n_assets, n_assets), rho)
+        np.fill_diagonal(correlation, 1.0)
+        return cls(correlation, jump_beta)
+
+    def _raw(self, generator: np.random.Generator, n: int, regime: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        normals = generator.standard_normal((n, regime.length, self.n_assets))
+        mixing = generator.chisquare(regime.df, (n, regime.length, 1))
+        jumps = np.zeros((n, regime.length))
+        if regime.shock_probability > 0:
+            hit = generator.random((n, regime.length)) < regime.shock_probability
+            jumps[hit] = generator.pareto(JUMP_TAIL_INDEX, hit.sum()) * regime.shock_scale
+        return normals, mixing, jumps
+
+    def _transform(self, normals: np.ndarray, mixing: np.ndarray, jumps: np.ndarray, regime: Any) -> np.ndarray:
+        # One GEMM for the whole chunk: (paths * time, assets) @ L^T.
+        correlated = (normals.reshape(-1, self.n_assets) @ self.factor.T).reshape(normals.shape)
+        correlated *= np.sqrt(regime.df / mixing)
+        correlated *= np.asarray(regime.sigma, dtype=float)
+        correlated += np.asarray(regime.mu, dtype=float)
+        correlated -= jumps[..., None] * self.jump_beta
+        return correlated
+
+    def chunk_size(self, n_steps: int) -> int:
+        return max(1, MAX_CHUNK_BYTES // (8 * n_steps * self.n_assets))
+
+    def chunks(
+        self,
+        regimes: Sequence[Any],
+        paths: int | slice | Iterable[int],
+        chunk_paths: int | None = None,
+        generator: np.random.Generator | None = None,
+        experiment: str | int | None = None,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        # Yield (path_ids, returns) with returns shaped (chunk, time, assets),
+        # regimes concatenated along time, at most chunk_paths paths at a time
+        # (by default as many as fit in MAX_CHUNK_BYTES). With `experiment`
+        # each path draws from its own path_rng generator, so its returns do
+        # not depend on the chunk size; otherwise chunks draw in order from
+        # `generator`.
+        regimes = list(regimes)
+        n_steps = sum(regime.length for regime in regimes)
+        chunk_paths = chunk_paths or self.chunk_size(n_steps)
+        path_ids = np.fromiter(_path_ids(paths), dtype=np.int64)
+        if experiment is None:
+            generator = generator or np.random.default_rng()
+        for lo in range(0, path_ids.size, chunk_paths):
+            ids = path_ids[lo:lo + chunk_paths]
+            out = np.empty((ids.size, n_steps, self.n_assets))
+            if experiment is None:
+                draws = [self._raw(generator, ids.size, regime) for regime in regimes]
+            else:
+                # Regime by regime, each path continuing its own stream.
+                generators = [path_generator(experiment, int(path_id)) for path_id in ids]
+                draws = [tuple(map(np.concatenate, zip(*(self._raw(g, 1, regime) for g in generators)))) for regime in regimes]
+            t = 0
+            for regime, raw in zip(regimes, draws):
+                out[:, t:t + regime.length] = self._transform(*raw, regime)
+                t += regime.length
+            yield ids, out
+
+    def sample(
+        self,
+        regimes: Sequence[Any],
+        paths: int | slice | Iterable[int],
+        chunk_paths: int | None = None,
+        generator: np.random.Generator | None = None,
+        experiment: str | int | None = None,
+    ) -> np.ndarray:
+        # All requested paths as one (paths, time, assets) array; use chunks()
+        # and reduce each block when the full array would not fit in memory.
+        return np.concatenate([block for _, block in self.chunks(regimes, paths, chunk_paths, generator, experiment)])
@@ -0,0 +1,258 @@
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import polars as pl
+
+from portfolio_backtest import rolling_mean_matrix
+
+# Splits scored per vectorized block; bounds the (splits, segments, configs)
+# gathers to a few hundred MB even for thousands of configurations.
+SPLIT_CHUNK = 64
+
+
+def sma_sweep_signals(
+    prices: np.ndarray,
+    short_windows: Iterable[int],
+    long_windows: Iterable[int],
+) -> tuple[np.ndarray, pl.DataFrame]:
+    # crossover_signals for every (short, long) pair with short < long, as a
+    # (time, configs) int8 matrix plus a frame describing the columns. Each
+    # distinct window's SMA is computed once over the whole series.
+    prices = np.asarray(prices, dtype=float)
+    pairs = [(short, long) for short in sorted(set(short_windows)) for long in sorted(set(long_windows)) if short < long]
+    if not pairs:
+        raise ValueError("No configuration has short_window < long_window")
+    windows = sorted({w for pair in pairs for w in pair})
+    column = {w: i for i, w in enumerate(windows)}
+    smas = np.column_stack([rolling_mean_matrix(prices[:, None], w)[:, 0] for w in windows])
+    signals = (smas[:, [column[s] for s, _ in pairs]] > smas[:, [column[l] for _, l in pairs]]).astype(np.int8)
+    configs = pl.DataFrame({
+        "config": np.arange(len(pairs)),
+        "short_window": [s for s, _ in pairs],
+        "long_window": [l for _, l in pairs],
+    })
+    return signals, configs
+
+
+def sma_sweep_returns(
+    prices: np.ndarray,
+    short_windows: Iterable[int],
+    long_windows: Iterable[int],
+    slippage_bps: float = 5.0,
+) -> tuple[np.ndarray, pl.DataFrame]:
+    # Per-bar strategy returns of every sma_sweep_signals column, with the
+    # same timing and costs as run_sma_crossover. Rows start at the longest
+    # warm-up's first bar with both SMAs, so every column covers the same bars.
+    prices = np.asarray(prices, dtype=float)
+    signals, configs = sma_sweep_signals(prices, short_windows, long_windows)
+    fee = slippage_bps / 10_000
+    returns = prices[1:] / prices[:-1] - 1
+    turnover = np.zeros(signals.shape)
+    turnover[1:] = np.abs(np.diff(signals, axis=0))
+    # As in run_sma_crossover, a column's first bar with both SMAs opens its
+    # position for free.
+    first_valid = configs["long_window"].to_numpy() - 1
+    turnover[first_valid, np.arange(signals.shape[1])] = 0.0
+    strategy = np.zeros(signals.shape)
+    strategy[1:] = signals[:-1] * returns[:, None] - turnover[1:] * fee
+    warm_up = int(first_valid.max())
+    return strategy[warm_up:], configs
+
+
+@dataclass(frozen=True)
+class PurgedSplit:
+    # Bars as (segments, 2) arrays of [start, stop) ranges. Test is the union
+    # of the test groups; train is everything else minus `purge` bars before
+    # and `embargo` bars after each contiguous test block.
+    test_groups: tuple[int, ...]
+    train: np.ndarray
+    test: np.ndarray
+
+
+def _blocks(groups: Iterable[int], edges: np.ndarray) -> list[tuple[int, int]]:
+    # Adjacent groups merge into one contiguous range.
+    blocks: list[tuple[int, int]] = []
+    for group in groups:
+        start, stop = int(edges[group]), int(edges[group + 1])
+        if blocks and blocks[-1][1] == start:
+            blocks[-1] = (blocks[-1][0], stop)
+        else:
+            blocks.append((start, stop))
+    return blocks
+
+
+def purged_splits(n_bars: int, n_groups: int = 10, n_test_groups: int = 2, purge: int = 0, embargo: int = 0) -> list[PurgedSplit]:
+    # Every way of choosing n_test_groups of n_groups contiguous groups as the
+    # test set (combinatorial purged CV). With n_test_groups = n_groups / 2
+    # this is the CSCV split set behind the probability of overfitting.
+    if not 0 < n_test_groups < n_groups <= n_bars:
+        raise ValueError(f"Need 0 < n_test_groups < n_groups <= n_bars, got {n_test_groups}, {n_groups}, {n_bars}")
+    edges = np.arange(n_groups + 1) * n_bars // n_groups
+    splits = []
+    for test_groups in itertools.combinations(range(n_groups), n_test_groups):
+        test = _blocks(test_groups, edges)
+        keep = np.ones(n_bars, dtype=bool)
+        for start, stop in test:
+            keep[max(start - purge, 0):stop + embargo] = False
+        flips = np.flatnonzero(np.diff(np.concatenate([[False], keep, [False]]).astype(np.int8)))
+        splits.append(PurgedSplit(test_groups, flips.reshape(-1, 2), np.array(test).reshape(-1, 2)))
+    return splits
+
+
+def _padded(ranges: list[np.ndarray]) -> np.ndarray:
+    # (splits, max_segments, 2); empty [0, 0) ranges pad the shorter lists.
+    out = np.zeros((len(ranges), max(len(r) for r in ranges), 2), dtype=np.int64)
+    for i, r in enumerate(ranges):
+        out[i, :len(r)] = r
+    return out
+
+
+class _SegmentSharpe:
+    # Sharpe of every config over any union of bar ranges from three
+    # cumulative sums, so a split costs (segments x configs) work however
+    # many bars it covers. Uses strategy_metrics' definition: annualised
+    # compound return over annualised volatility.
+    def __init__(self, returns: np.ndarray, periods_per_year: int):
+        self.periods = periods_per_year
+        with np.errstate(divide="ignore", invalid="ignore"):
+            layers = [np.log1p(returns), returns, np.square(returns)]
+        self.cumulative = []
+        for layer in layers:
+            cumulative = np.zeros((returns.shape[0] + 1, returns.shape[1]))
+            np.cumsum(layer, axis=0, out=cumulative[1:])
+            self.cumulative.append(cumulative)
+
+    def __call__(self, bounds: np.ndarray) -> np.ndarray:
+        starts, stops = bounds[..., 0], bounds[..., 1]
+        n = (stops - starts).sum(axis=1)[:, None].astype(float)
+        log_sum, total, squares = ((c[stops] - c[starts]).sum(axis=1) for c in self.cumulative)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            ann_return = np.expm1(log_sum * self.periods / n)
+            variance = np.maximum(squares - total * total / n, 0) / (n - 1)
+            ann_vol = np.sqrt(self.periods * variance)
+            sharpe = ann_return / ann_vol
+        return np.where((ann_vol > 0) & np.isfinite(sharpe), sharpe, np.nan)
+
+
+@dataclass
+class OverfitReport:
+    configs: pl.DataFrame
+    splits: pl.DataFrame
+    paths: pl.DataFrame
+    path_returns: np.ndarray
+
+    @property
+    def pbo(self) -> float:
+        # Share of splits whose in-sample winner lands in the bottom half out of sample.
+        return float((self.splits["logit"] <= 0).mean())
+
+    @property
+    def summary(self) -> pl.DataFrame:
+        splits = self.splits
+        is_sharpe, oos_sharpe = splits["is_sharpe"].to_numpy(), splits["oos_sharpe"].to_numpy()
+        finite = np.isfinite(is_sharpe) & np.isfinite(oos_sharpe)
+        slope = float(np.polyfit(is_sharpe[finite], oos_sharpe[finite], 1)[0]) if finite.sum() > 1 else float("nan")
+        return pl.DataFrame({
+            "metric": [
+                "Configurations",
+                "Splits",
+                "Probability of overfitting",
+                "Median in-sample Sharpe",
+                "Median out-of-sample Sharpe",
+                "P(out-of-sample Sharpe < 0)",
+                "Degradation slope",
+                "Distinct winners",
+                "CPCV paths",
+                "Median path Sharpe",
+            ],
+            "value": [
+                float(self.configs.height),
+                float(splits.height),
+                self.pbo,
+                float(np.nanmedian(is_sharpe)),
+                float(np.nanmedian(oos_sharpe)),
+                float(np.mean(oos_sharpe[np.isfinite(oos_sharpe)] < 0)),
+                slope,
+                float(splits["config"].n_unique()),
+                float(self.paths.height),
+                float(self.paths["sharpe"].median()),
+            ],
+        })
+
+
+def cpcv_report(
+    returns: np.ndarray,
+    configs: pl.DataFrame | None = None,
+    n_groups: int = 10,
+    n_test_groups: int = 5,
+    purge: int = 0,
+    embargo: int = 0,
+    periods_per_year: int = 252,
+) -> OverfitReport:
+    # Pick the best-Sharpe config on each split's training bars and score it
+    # on the test groups. `splits` has one row per split with the winner's
+    # in/out-of-sample Sharpe, its relative out-of-sample rank w among all
+    # configs and the logit log(w / (1 - w)); PBO is the share of logits <= 0.
+    # `paths` / `path_returns` are the CPCV backtest paths: each group's bars
+    # come from a different split's winner, giving C(n_groups - 1,
+    # n_test_groups - 1) full-length out-of-sample histories. Everything is
+    # read off the shared (time, configs) `returns` matrix, so no backtest is
+    # rerun per split; set embargo to the longest lookback (e.g. long_window)
+    # so training bars never see test prices through their indicators.
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    n_bars, n_configs = returns.shape
+    configs = configs if configs is not None else pl.DataFrame({"config": np.arange(n_configs)})
+    splits = purged_splits(n_bars, n_groups, n_test_groups, purge, embargo)
+    sharpe = _SegmentSharpe(returns, periods_per_year)
+
+    best = np.empty(len(splits), dtype=np.int64)
+    is_best, oos_best, rank = (np.empty(len(splits)) for _ in range(3))
+    for lo in range(0, len(splits), SPLIT_CHUNK):
+        block = splits[lo:lo + SPLIT_CHUNK]
+        rows = slice(lo, lo + len(block))
+        train = np.nan_to_num(sharpe(_padded([s.train for s in block])), nan=-np.inf)
+        test = np.nan_to_num(sharpe(_padded([s.test for s in block])), nan=-np.inf)
+        best[rows] = train.argmax(axis=1)
+        picked = test[np.arange(len(block)), best[rows]]
+        is_best[rows] = train[np.arange(len(block)), best[rows]]
+        oos_best[rows] = picked
+        # Relative rank in (0, 1), ties counted half so a flat grid scores 0.5.
+        below = (test < picked[:, None]).sum(axis=1) + 0.5 * ((test == picked[:, None]).sum(axis=1) - 1)
+        rank[rows] = (below + 1) / (n_configs + 1)
+
+    split_frame = pl.DataFrame({
+        "split": np.arange(len(splits)),
+        "test_groups": [",".join(map(str, s.test_groups)) for s in splits],
+        "config": best,
+        "is_sharpe": np.where(np.isfinite(is_best), is_best, np.nan),
+        "oos_sharpe": np.where(np.isfinite(oos_best), oos_best, np.nan),
+        "oos_rank": rank,
+        "logit": np.log(rank / (1 - rank)),
+    })
+    split_frame = split_frame.join(configs, on="config", how="left") if configs.width > 1 else split_frame
+
+    # Path j takes group g from the j-th split (in order) that tests g.
+    n_paths = math.comb(n_groups - 1, n_test_groups - 1)
+    edges = np.arange(n_groups + 1) * n_bars // n_groups
+    path_returns = np.empty((n_paths, n_bars))
+    path_config = np.empty((n_paths, n_groups), dtype=np.int64)
+    seen = np.zeros(n_groups, dtype=np.int64)
+    for split, pick in zip(splits, best):
+        for group in split.test_groups:
+            bars = slice(edges[group], edges[group + 1])
+            path_returns[seen[group], bars] = returns[bars, pick]
+            path_config[seen[group], group] = pick
+            seen[group] += 1
+    path_sharpe = _SegmentSharpe(path_returns.T, periods_per_year)(np.array([[[0, n_bars]]]))[0]
+    path_frame = pl.DataFrame({
+        "path": np.arange(n_paths),
+        "sharpe": path_sharpe,
+        "total_return": np.prod(1 + path_returns, axis=1) - 1,
+        "distinct_configs": [len(set(row)) for row in path_config],
+    })
+    return OverfitReport(configs, split_frame, path_frame, path_returns)
@@ -1,24 +1,17 @@
 from manim import *
-import random
 import numpy as np
 
-random.seed(1)
+from galton_geometry import ALPHA, BALL_RADIUS, BASE, BETA, BIN_HEIGHT, DY, FALL_TIME, LOG_START_Y, PEG_RADIUS, ROWS, X_SCALE, ball_experiment
+from path_rng import path_generator
 
 class ParetoGaltonBoard(Scene):
     def construct(self):
         # Constants
-        ROWS = 12
         COLS = 12
-        BALL_RADIUS = 0.06
         TOTAL_BALLS = 150
         
-        # Pareto/Lognormal specific constants
-        BASE = 1.3  # The multiplicative factor for spacing
-        
         # Vertical spacing
-        DY = 0.45
-        START_Y = 3.2
-        X_SCALE = 2.0 
+        START_Y = LOG_START_Y
         
         # Helper to get x position (Exponential spacing)
         def get_x(row, col):
@@ -37,14 +30,14 @@ class ParetoGaltonBoard(Scene):
             for col in range(row + 1):
                 x = get_x(row, col)
                 y = START_Y - row * DY
-                peg = Dot(point=[x, y, 0], radius=0.05, color=WHITE)
+                peg = Dot(point=[x, y, 0], radius=PEG_RADIUS, color=WHITE)
                 pegs.add(peg)
         
         self.add(pegs)
 
         # Create Bins
         bins = VGroup()
-        bin_height = 1.5
+        bin_height = BIN_HEIGHT
         bin_y_top = START_Y - ROWS * DY + DY / 2
         bin_y_bottom = bin_y_top - bin_height
         
@@ -104,10 +97,8 @@ class ParetoGaltonBoard(Scene):
         # P(right) = (k + alpha) / (n + alpha + beta)
         # We want a decaying distribution, so we need low probability of moving right initially.
         # But if you move right, it gets easier.
-        ALPHA = 1.0
-        BETA = 3.0
         
-        for _ in range(TOTAL_BALLS):
+        for ball_id in range(TOTAL_BALLS):
             ball = make_ball()
             balls.add(ball)
             
@@ -115,6 +106,7 @@ class ParetoGaltonBoard(Scene):
             current_x = get_x(0, 0)
             current_y = START_Y + DY
             path_points = [np.array([current_x, current_y, 0])]
+            turns = path_generator(ball_experiment("pareto"), ball_id).random(ROWS)
             
             # Fall through pegs
             for row in range(ROWS):
@@ -125,7 +117,7 @@ class ParetoGaltonBoard(Scene):
                 # Formula: P(Right) = (col_index + ALPHA) / (row + ALPHA + BETA)
                 prob_right = (col_index + ALPHA) / (row + ALPHA + BETA)
                 
-                if random.random() < prob_right:
+                if turns[row] < prob_right:
                     direction = 1
                 else:
                     direction = 0
@@ -150,7 +142,7 @@ class ParetoGaltonBoard(Scene):
             path = VMobject()
             path.set_points_as_corners(path_points)
             
-            anim = MoveAlongPath(ball, path, run_time=2.0, rate_func=linear)
+            anim = MoveAlongPath(ball, path, run_time=FALL_TIME, rate_func=linear)
             animations.append(anim)
 
         self.play(LaggedStart(*animations, lag_ratio=0.1, run_time=TOTAL_BALLS * 0.2 + 2))
@@ -0,0 +1,51 @@
+import hashlib
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+# Philox takes a 128-bit key: one word for the experiment, one for the path.
+KEY_WORD = 2**64
+
+
+def experiment_key(experiment: str | int) -> int:
+    # Integers are used as-is; names are hashed, so "stress-basket" means the
+    # same stream in every session and process.
+    if isinstance(experiment, (int, np.integer)):
+        return int(experiment) % KEY_WORD
+    return int.from_bytes(hashlib.sha256(str(experiment).encode()).digest()[:8], "little")
+
+
+def path_generator(experiment: str | int, path_id: int) -> np.random.Generator:
+    # Philox is counter-based: the key (experiment, path_id) fixes the whole
+    # stream, so path 900,000 is built directly in constant time instead of
+    # replaying every path before it.
+    if not 0 <= path_id < KEY_WORD:
+        raise ValueError(f"path_id must be in [0, 2**64), got {path_id}")
+    return np.random.Generator(np.random.Philox(key=[int(path_id), experiment_key(experiment)]))
+
+
+def _path_ids(paths: int | slice | Iterable[int]) -> Iterable[int]:
+    if isinstance(paths, (int, np.integer)):
+        return range(int(paths))
+    if isinstance(paths, slice):
+        if paths.stop is None:
+            raise ValueError("A slice of path ids needs an explicit stop")
+        return range(paths.start or 0, paths.stop, paths.step or 1)
+    return paths
+
+
+def path_generators(experiment: str | int, paths: int | slice | Iterable[int]) -> Iterator[np.random.Generator]:
+    # `paths` is a count (ids 0..n-1), a slice of ids, or any iterable of ids.
+    for path_id in _path_ids(paths):
+        yield path_generator(experiment, path_id)
+
+
+def draw_paths(
+    experiment: str | int,
+    paths: int | slice | Iterable[int],
+    sampler: Callable[[np.random.Generator], np.ndarray],
+) -> np.ndarray:
+    # Stack sampler(generator) over path ids into a (paths, ...) array. Row
+    # contents depend only on (experiment, path_id), never on which block
+    # or order the path was drawn in.
+    return np.stack([np.asarray(sampler(generator)) for generator in path_generators(experiment, paths)])
@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from typing import Callable, Mapping
+
+import numpy as np
+import polars as pl
+
+DAYS_PER_YEAR = 252
+# Paths per block when pricing; path statistics are shared by every payoff
+# in the book, so the (paths, time) work is done once per block.
+PATH_CHUNK = 65_536
+
+
+@dataclass
+class PathStats:
+    # Per-path summaries of a (paths, time) block of simple returns, on price
+    # paths normalised to start at 1. Extremes include the starting level, so
+    # barriers are monitored discretely from t = 0.
+    returns: np.ndarray
+    terminal: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    average: np.ndarray
+    realized_var: np.ndarray
+
+    @classmethod
+    def from_returns(cls, returns: np.ndarray) -> "PathStats":
+        levels = np.cumprod(1 + returns, axis=1)
+        return cls(
+            returns=returns,
+            terminal=levels[:, -1],
+            high=np.maximum(levels.max(axis=1), 1.0),
+            low=np.minimum(levels.min(axis=1), 1.0),
+            average=levels.mean(axis=1),
+            # Simple rather than log returns: shocked series can drop below -100%.
+            realized_var=np.square(returns).sum(axis=1),
+        )
+
+    @property
+    def steps(self) -> int:
+        return self.returns.shape[1]
+
+
+def _vanilla(level: np.ndarray, strike: float, kind: str) -> np.ndarray:
+    if kind == "call":
+        return np.maximum(level - strike, 0.0)
+    if kind == "put":
+        return np.maximum(strike - level, 0.0)
+    raise ValueError(f"Unknown option kind {kind!r}; use 'call' or 'put'")
+
+
+@dataclass(frozen=True)
+class PointwisePayoff:
+    # Sum of a per-return payoff over the path, e.g. convex_payoff/concave_payoff
+    # as in the section 4 Monte Carlo.
+    func: Callable[[np.ndarray], np.ndarray]
+
+    def __call__(self, stats: PathStats) -> np.ndarray:
+        return self.func(stats.returns).sum(axis=1)
+
+
+@dataclass(frozen=True)
+class Straddle:
+    strike: float = 1.0
+    premium: float = 0.0
+
+    def __call__(self, stats: PathStats) -> np.ndarray:
+        return np.abs(stats.terminal - self.strike) - self.premium
+
+
+@dataclass(frozen=True)
+class ProtectivePut:
+    # Long the underlying plus a put struck at `strike`: P&L floored near strike - 1.
+    strike: float = 0.9
+    premium: float = 0.0
+
+    def __call__(self, stats: PathStats) -> np.ndarray:
+        return stats.terminal - 1.0 + _vanilla(stats.terminal, self.strike, "put") - self.premium
+
+
+@dataclass(frozen=True)
+class BarrierOption:
+    strike: float
+    barrier: float
+    kind: str = "call"
+    direction: str = "up"
+    knock: str = "out"
+    rebate: float = 0.0
+    premium: float = 0.0
+
+    def __call__(self, stats: PathStats) -> np.ndarray:
+        if self.direction == "up":
+            hit = stats.high >= self.barrier
+        elif self.direction == "down":
+            hit = stats.low <= self.barrier
+        else:
+            raise ValueError(f"Unknown barrier direction {self.direction!r}; use 'up' or 'down'")
+        if self.knock not in ("in", "out"):
+            raise ValueError(f"Unknown knock type {self.knock!r}; use 'in' or 'out'")
+        alive = hit if self.knock == "in" else ~hit
+        return np.where(alive, _vanilla(stats.terminal, self.strike, self.kind), self.rebate) - self.premium
+
+
+@dataclass(frozen=True)
+class LookbackOption:
+    # Floating strike: a call pays S_T - min S, a put pays max S - S_T.
+    kind: str = "call"
+    premium: float = 0.0
+
+    def __call__(self, stats: PathStats) -> np.ndarray:
+        if self.kind == "call":
+            return stats.terminal - stats.low - self.premium
+        if self.kind == "put":
+            return stats.high - stats.terminal - self.premium
+        raise ValueError(f"Unknown option kind {self.kind!r}; use 'call' or 'put'")
+
+
+@dataclass(frozen=True)
+class AsianOption:
+    strike: float = 1.0
+    kind: str = "call"
+    premium: float = 0.0
+
+    def __call__(self, stats: PathStats) -> np.ndarray:
+        return _vanilla(stats.average, self.strike, self.kind) - self.premium
+
+
+@dataclass(frozen=True)
+class VarianceSwap:
+    # Pays notional * (realised variance - strike variance) over the path, both
+    # annualised. A negative notional is the short-vol carry trade: small
+    # steady gains until realised variance explodes.
+    strike_vol: float = 0.2
+    notional: float = 1.0
+
+    def __call__(self, stats: PathStats) -> np.ndarray:
+        realized = stats.realized_var * DAYS_PER_YEAR / stats.steps
+        return self.notional * (realized - self.strike_vol**2)
+
+
+def price_payoffs(returns: np.ndarray, payoffs: Mapping[str, Callable[[PathStats], np.ndarray]]) -> pl.DataFrame:
+    # One row per path, one column per payoff.
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 1:
+        returns = returns[None, :]
+    values = {name: np.empty(returns.shape[0]) for name in payoffs}
+    for lo in range(0, returns.shape[0], PATH_CHUNK):
+        stats = PathStats.from_returns(returns[lo:lo + PATH_CHUNK])
+        for name, payoff in payoffs.items():
+            values[name][lo:lo + PATH_CHUNK] = payoff(stats)
+    return pl.DataFrame(values)
+
+
+def payoff_summary(values: pl.DataFrame, label: str) -> pl.DataFrame:
+    # Same columns as the section 4 mc_summary, one row per payoff.
+    return pl.DataFrame([
+        {
+            "regime": label,
+            "payoff": name,
+            "mean": values[name].mean(),
+            "std": values[name].std(),
+            "p05": values[name].quantile(0.05),
+            "p95": values[name].quantile(0.95),
+        }
+        for name in values.columns
+    ])
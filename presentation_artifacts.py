@@ -0,0 +1,121 @@
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from path_rng import draw_paths
+from shock_overlay import draw_shocks
+
+# Where the notebook writes and FatTailsPresentation reads by default; the
+# FAT_TAILS_ARTIFACTS environment variable overrides it.
+DEFAULT_PATH = Path(".cache/fat_tails_artifacts.npz")
+# path_rng experiment the presentation paths are keyed on.
+EXPERIMENT = "presentation"
+
+
+@dataclass
+class PresentationArtifacts:
+    # Everything FatTailsPresentation draws, as plain arrays: price paths
+    # (paths, steps + 1) starting at 1, return densities on a shared grid,
+    # and payoff curves on a grid of market moves. normal_move (a one-sigma
+    # down day) and extreme_move (a tail crash) are where the payoff dots go.
+    gaussian_prices: np.ndarray
+    fat_tailed_prices: np.ndarray
+    return_grid: np.ndarray
+    gaussian_density: np.ndarray
+    fat_tailed_density: np.ndarray
+    move_grid: np.ndarray
+    convex_payoff: np.ndarray
+    concave_payoff: np.ndarray
+    normal_move: float
+    extreme_move: float
+
+    def save(self, path: str | os.PathLike = DEFAULT_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, **asdict(self))
+        return path
+
+    @classmethod
+    def load(cls, path: str | os.PathLike = DEFAULT_PATH) -> "PresentationArtifacts":
+        with np.load(path) as data:
+            values = {f.name: data[f.name] for f in fields(cls)}
+        values["normal_move"] = float(values["normal_move"])
+        values["extreme_move"] = float(values["extreme_move"])
+        return cls(**values)
+
+
+def _prices(returns: np.ndarray) -> np.ndarray:
+    levels = np.cumprod(1 + np.atleast_2d(returns), axis=1)
+    return np.hstack([np.ones((levels.shape[0], 1)), levels])
+
+
+def _density(samples: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    # Share of all samples per unit return, so mass outside the grid still counts.
+    return np.histogram(samples, edges)[0] / (samples.size * np.diff(edges))
+
+
+def build_artifacts(
+    gaussian_returns: np.ndarray,
+    fat_tailed_returns: np.ndarray,
+    convex: Callable[[np.ndarray], np.ndarray],
+    concave: Callable[[np.ndarray], np.ndarray],
+    bins: int = 121,
+    coverage: float = 0.998,
+) -> PresentationArtifacts:
+    # From (paths, steps) return matrices and payoff functions, e.g. the
+    # notebook's section 1/2 generators and convex_payoff/concave_payoff.
+    # Densities are histograms over the central `coverage` of the fat-tailed
+    # returns, so the plot shows the tails without one crash flattening it;
+    # the crash the payoff dots travel to is that range's lower end.
+    gaussian_returns, fat_tailed_returns = np.atleast_2d(gaussian_returns), np.atleast_2d(fat_tailed_returns)
+    tail = (1 - coverage) / 2
+    lo, hi = np.quantile(fat_tailed_returns, [tail, 1 - tail])
+    bound = max(abs(lo), abs(hi))
+    edges = np.linspace(-bound, bound, bins + 1)
+    moves = np.linspace(-bound, bound, 301)
+    return PresentationArtifacts(
+        gaussian_prices=_prices(gaussian_returns),
+        fat_tailed_prices=_prices(fat_tailed_returns),
+        return_grid=(edges[:-1] + edges[1:]) / 2,
+        gaussian_density=_density(gaussian_returns, edges),
+        fat_tailed_density=_density(fat_tailed_returns, edges),
+        move_grid=moves,
+        convex_payoff=np.asarray(convex(moves), dtype=float),
+        concave_payoff=np.asarray(concave(moves), dtype=float),
+        normal_move=-float(gaussian_returns.std()),
+        extreme_move=float(lo),
+    )
+
+
+def presentation_returns(n_paths: int = 300, n_steps: int = 252, experiment: str = EXPERIMENT) -> tuple[np.ndarray, np.ndarray]:
+    # (gaussian, fat_tailed) return matrices for the walkthrough: section 1's
+    # Gaussian days and section 2's Student-t days with Pareto crashes, as
+    # the notebook's gaussian_returns / student_t_returns / inject_shocks
+    # draw them, path i from path_rng key (experiment/kind, i). The notebook
+    # export and the fallback below both come from here.
+    def gaussian(generator: np.random.Generator) -> np.ndarray:
+        return generator.normal(0.0004, 0.015, n_steps)
+
+    def fat_tailed(generator: np.random.Generator) -> np.ndarray:
+        returns = 0.0002 + 0.025 * generator.standard_t(3, n_steps)
+        return draw_shocks(n_steps, 0.008, 0.35, generator).apply(returns)
+
+    return draw_paths(f"{experiment}/gaussian", n_paths, gaussian), draw_paths(f"{experiment}/fat-tailed", n_paths, fat_tailed)
+
+
+def default_artifacts(n_paths: int = 300, n_steps: int = 252, experiment: str = EXPERIMENT) -> PresentationArtifacts:
+    # Fallback when no notebook export exists: the same paths the notebook
+    # exports, with its convex_payoff / concave_payoff curves.
+    return build_artifacts(
+        *presentation_returns(n_paths, n_steps, experiment),
+        convex=lambda x: np.exp(4 * x) - 1,
+        concave=lambda x: 1 - np.exp(-4 * x),
+    )
+
+
+def load_or_default(path: str | os.PathLike | None = None) -> PresentationArtifacts:
+    path = Path(path or os.environ.get("FAT_TAILS_ARTIFACTS", DEFAULT_PATH))
+    return PresentationArtifacts.load(path) if path.exists() else default_artifacts()
@@ -0,0 +1,264 @@
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Bump when the on-disk layout changes so stale entries are never read back.
+CACHE_FORMAT = 1
+
+
+def _update(h: "hashlib._Hash", value: Any) -> None:
+    # Canonical, type-tagged walk over the arguments. Arrays and frames are
+    # hashed by content, dataclasses (e.g. Regime) by field values.
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.random.Generator):
+        h.update(b"rng:")
+        _update(h, value.bit_generator.state)
+    elif isinstance(value, np.ndarray):
+        arr = np.ascontiguousarray(value)
+        h.update(f"ndarray:{arr.dtype.str}:{arr.shape};".encode())
+        h.update(arr.view(np.uint8).data if arr.dtype != object else pickle.dumps(arr))
+    elif isinstance(value, np.generic):
+        _update(h, value.item())
+    elif isinstance(value, pl.Series):
+        _update(h, value.to_frame())
+    elif isinstance(value, pl.DataFrame):
+        h.update(f"polars:{value.schema};".encode())
+        for column in value.get_columns():
+            _update(h, column.to_numpy())
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(f"pandas:{type(value).__name__};".encode())
+        if isinstance(value, pd.DataFrame):
+            _update(h, [str(c) for c in value.columns])
+            _update(h, [str(d) for d in value.dtypes])
+        _update(h, pd.util.hash_pandas_object(value, index=True).to_numpy())
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        h.update(f"dataclass:{type(value).__qualname__}:".encode())
+        _update(h, {f.name: getattr(value, f.name) for f in dataclasses.fields(value)})
+    elif isinstance(value, dict):
+        h.update(f"dict:{len(value)}:".encode())
+        for key in sorted(value, key=repr):
+            _update(h, key)
+            _update(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _update(h, item)
+    elif callable(value):
+        h.update(function_identity(value).encode())
+    else:
+        h.update(b"pickle:")
+        h.update(pickle.dumps(value))
+
+
+def function_identity(func: Callable) -> str:
+    # Module, qualified name and source: editing a function body invalidates
+    # its cache entries even when the name stays the same.
+    func = inspect.unwrap(func)
+    try:
+        body = inspect.getsource(func)
+    except (OSError, TypeError):
+        if isinstance(func, type):
+            # Notebook classes have no source file; fall back to their members
+            # so e.g. SMACrossover.long_window still feeds the key.
+            body = repr(sorted(
+                (name, function_identity(attr) if inspect.isfunction(attr) else repr(attr))
+                for name, attr in vars(func).items()
+                if not name.startswith("__")
+            ))
+        else:
+            code = getattr(func, "__code__", None)
+            body = code.co_code.hex() if code is not None else repr(func)
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    return f"{name}:{hashlib.sha256(body.encode()).hexdigest()}"
+
+
+def stable_hash(*values: Any) -> str:
+    # Content hash of arbitrary arguments, stable across processes and sessions.
+    h = hashlib.sha256(f"format:{CACHE_FORMAT};".encode())
+    for value in values:
+        _update(h, value)
+    return h.hexdigest()
+
+
+def cache_key(func: Callable, args: tuple = (), kwargs: dict | None = None, rng: np.random.Generator | None = None, depends_on: tuple = ()) -> str:
+    h = hashlib.sha256(f"format:{CACHE_FORMAT};".encode())
+    h.update(function_identity(func).encode())
+    for dependency in depends_on:
+        h.update(function_identity(dependency).encode())
+    bound = inspect.signature(func).bind(*args, **(kwargs or {}))
+    bound.apply_defaults()
+    _update(h, dict(bound.arguments))
+    if rng is not None:
+        _update(h, rng)
+    return h.hexdigest()
+
+
+class UnpicklableResult(Exception):
+    # Raised by _write_value when a value has to be pickled and cannot be.
+    pass
+
+
+def _write_value(value: Any, folder: Path, name: str) -> Any:
+    # Arrays go to .npy and frames to Arrow IPC so hits can be memory-mapped
+    # (arrays come back read-only). Tuples/lists are split so that e.g.
+    # (metrics, stats_dict) keeps its frame zero-copy; anything else is pickled.
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        np.save(folder / f"{name}.npy", value, allow_pickle=False)
+        return {"kind": "npy", "file": f"{name}.npy"}
+    if isinstance(value, pl.DataFrame):
+        value.write_ipc(folder / f"{name}.arrow", compression="uncompressed")
+        return {"kind": "polars", "file": f"{name}.arrow"}
+    if isinstance(value, pl.Series):
+        value.to_frame().write_ipc(folder / f"{name}.arrow", compression="uncompressed")
+        return {"kind": "polars_series", "file": f"{name}.arrow"}
+    if isinstance(value, pd.DataFrame):
+        try:
+            table = pa.Table.from_pandas(value, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            pass
+        else:
+            feather.write_feather(table, folder / f"{name}.arrow", compression="uncompressed")
+            return {"kind": "pandas", "file": f"{name}.arrow"}
+    if isinstance(value, (tuple, list)):
+        parts = [_write_value(item, folder, f"{name}.{i}") for i, item in enumerate(value)]
+        return {"kind": type(value).__name__, "parts": parts}
+    try:
+        with open(folder / f"{name}.pkl", "wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as exc:
+        # Only pickle's own failures mean "unstorable"; errors from the
+        # Arrow/.npy writers above are bugs and propagate unchanged.
+        raise UnpicklableResult(str(exc)) from exc
+    return {"kind": "pickle", "file": f"{name}.pkl"}
+
+
+def _read_value(spec: dict, folder: Path) -> Any:
+    kind = spec["kind"]
+    if kind in ("tuple", "list"):
+        items = [_read_value(part, folder) for part in spec["parts"]]
+        return tuple(items) if kind == "tuple" else items
+    path = folder / spec["file"]
+    if kind == "npy":
+        return np.load(path, mmap_mode="r")
+    if kind in ("polars", "polars_series"):
+        frame = pl.from_arrow(feather.read_table(path, memory_map=True))
+        return frame.to_series() if kind == "polars_series" else frame
+    if kind == "pandas":
+        return feather.read_table(path, memory_map=True).to_pandas()
+    with open(path, "rb") as fh:
+        return pickle.load(fh)
+
+
+class ResultCache:
+    def __init__(self, directory: str | os.PathLike = ".cache/results", max_bytes: int | None = 2 * 1024**3, max_entries: int | None = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str) -> tuple[bool, Any, dict]:
+        folder = self._entry(key)
+        try:
+            manifest = json.loads((folder / "manifest.json").read_text())
+            value = _read_value(manifest["value"], folder)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            return False, None, {}
+        # The directory mtime doubles as the LRU clock.
+        os.utime(folder)
+        return True, value, manifest
+
+    def put(self, key: str, value: Any, extra: dict | None = None) -> None:
+        staging = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.directory))
+        try:
+            manifest = {"format": CACHE_FORMAT, "created": time.time(), "value": _write_value(value, staging, "value")}
+            manifest.update(extra or {})
+            (staging / "manifest.json").write_text(json.dumps(manifest))
+            target = self._entry(key)
+            if target.exists():
+                shutil.rmtree(target, ignore_errors=True)
+            os.replace(staging, target)
+        except UnpicklableResult as exc:
+            # An unstorable result should cost a recompute next time, not the run.
+            shutil.rmtree(staging, ignore_errors=True)
+            warnings.warn(f"Not caching {extra.get('function', key) if extra else key}: {exc}", stacklevel=3)
+            return
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.evict()
+
+    def entries(self) -> list[tuple[Path, float, int]]:
+        rows = []
+        for folder in self.directory.iterdir():
+            if not folder.is_dir() or folder.name.startswith("."):
+                continue
+            size = sum(f.stat().st_size for f in folder.iterdir() if f.is_file())
+            rows.append((folder, folder.stat().st_mtime, size))
+        return rows
+
+    def evict(self) -> None:
+        rows = sorted(self.entries(), key=lambda row: row[1])
+        total = sum(size for _, _, size in rows)
+        while rows and (
+            (self.max_bytes is not None and total > self.max_bytes)
+            or (self.max_entries is not None and len(rows) > self.max_entries)
+        ):
+            folder, _, size = rows.pop(0)
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        for folder, _, _ in self.entries():
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def memoize(self, func: Callable | None = None, *, rng: np.random.Generator | None = None, depends_on: Iterable[Callable] = ()) -> Callable:
+        # Pass the generator a function draws from (the notebook's global
+        # `rng`) so its state is part of the key. On a hit the generator is
+        # fast-forwarded to where the real call would have left it, keeping
+        # every later cell on the same random stream. `depends_on` lists the
+        # helpers/classes the function calls so editing them invalidates too.
+        depends_on = tuple(depends_on)
+        if func is None:
+            return functools.partial(self.memoize, rng=rng, depends_on=depends_on)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache_key(func, args, kwargs, rng=rng, depends_on=depends_on)
+            found, value, manifest = self.get(key)
+            if found:
+                self.hits += 1
+                if rng is not None and "rng_state" in manifest:
+                    rng.bit_generator.state = manifest["rng_state"]
+                return value
+            self.misses += 1
+            value = func(*args, **kwargs)
+            extra = {"function": function_identity(func).split(":")[0]}
+            if rng is not None:
+                extra["rng_state"] = rng.bit_generator.state
+            self.put(key, value, extra)
+            return value
+
+        wrapper.cache = self
+        return wrapper
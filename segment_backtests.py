@@ -0,0 +1,302 @@
+import gc
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from multiprocessing import util
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+import polars as pl
+from backtesting import Backtest, Strategy
+
+from result_cache import ResultCache, cache_key, function_identity
+from streaming_signals import CROSS_ABOVE, CROSS_BELOW, SMACrossoverEngine
+from tail_risk import tail_metrics
+
+# Below this many uncached segments run_segments backtests inline: spawning
+# a pool costs a second or two, more than a few backtests take.
+PARALLEL_MIN_SEGMENTS = 16
+
+# (label, start, end) windows per symbol, as in the notebook's real_segments.
+Segments = Mapping[str, Iterable[tuple[str, str, str]]]
+
+
+def rolling_sma(values, window):
+    series = pd.Series(values)
+    return series.rolling(window).mean().to_numpy()
+
+
+class SMACrossover(Strategy):
+    short_window = 20
+    long_window = 100
+    slippage_bps = 5
+
+    def init(self):
+        # Indicators are kept for the backtesting.py plot; trading decisions
+        # come from the O(1)-per-bar engine.
+        self.sma_short = self.I(rolling_sma, self.data.Close, self.short_window)
+        self.sma_long = self.I(rolling_sma, self.data.Close, self.long_window)
+        self.engine = SMACrossoverEngine(self.short_window, self.long_window)
+
+    def next(self):
+        # backtesting.py skips the indicator warm-up, so catch the engine up
+        # on any bars it has not seen yet (only the first call is a batch).
+        close = self.data.Close
+        if len(close) - self.engine.bars == 1:
+            event = self.engine.update(close[-1])
+        else:
+            event = int(self.engine.update_many(close[self.engine.bars:]).events[-1])
+        if event == CROSS_ABOVE:
+            if not self.position.is_long:
+                self.position.close()
+                self.buy()
+        elif event == CROSS_BELOW:
+            if self.position.is_long:
+                self.position.close()
+
+
+# Everything backtest_metrics' output depends on besides its arguments; pass
+# as cache.memoize(depends_on=...) so editing any of them invalidates.
+BACKTEST_DEPENDENCIES = (SMACrossover, SMACrossoverEngine, rolling_sma)
+
+
+# The stats headline_row and the notebook's segment loop read. backtest_metrics
+# returns only these, so workers do not pickle the strategy instance, equity
+# curve and trade list back to the parent and into the cache.
+STATS_KEYS = ("Return [%]", "CAGR [%]", "Sharpe Ratio", "Max. Drawdown [%]")
+
+
+def _pct(value: float | None) -> float:
+    return float(value) / 100 if value is not None else float('nan')
+
+
+def backtest_metrics(data: pd.DataFrame, label: str) -> tuple[pl.DataFrame, dict]:
+    if len(data) < SMACrossover.long_window:
+        raise ValueError(f"Need at least {SMACrossover.long_window} observations, got {len(data)}")
+
+    commission = SMACrossover.slippage_bps / 10_000
+    bt = Backtest(
+        data,
+        SMACrossover,
+        cash=100_000,
+        commission=commission,
+        trade_on_close=True,
+    )
+    stats = bt.run()
+    stats_dict = stats.to_dict()
+
+    metrics = pl.DataFrame({
+        "metric": [
+            "Total return",
+            "Annualized return",
+            "Annualized vol",
+            "Sharpe",
+            "Max drawdown",
+            "Hit rate",
+        ],
+        "value": [
+            _pct(stats_dict.get("Return [%]")),
+            _pct(stats_dict.get("CAGR [%]")),
+            _pct(stats_dict.get("Volatility (ann.) [%]")),
+            float(stats_dict.get("Sharpe Ratio", float('nan'))),
+            _pct(stats_dict.get("Max. Drawdown [%]")),
+            _pct(stats_dict.get("Win Rate [%]")),
+        ],
+        "label": [label] * 6,
+    })
+    daily_returns = pl.Series(stats["_equity_curve"]["Equity"].pct_change().to_numpy())
+    metrics = pl.concat([metrics, tail_metrics(daily_returns, label)])
+
+    return metrics, {key: stats_dict[key] for key in STATS_KEYS if key in stats_dict}
+
+
+def headline_row(label: str, stats_dict: dict) -> dict:
+    return {
+        "label": label,
+        "total_return": _pct(stats_dict.get("Return [%]")),
+        "cagr": _pct(stats_dict.get("CAGR [%]")),
+        "sharpe": float(stats_dict.get("Sharpe Ratio", float('nan'))),
+        "max_drawdown": _pct(stats_dict.get("Max. Drawdown [%]")),
+    }
+
+
+@dataclass(frozen=True)
+class SharedHistory:
+    # Handle to one OHLCV frame published in shared memory: the block holds
+    # the index as int64 nanoseconds followed by one float64 row per column,
+    # so each column is contiguous. Small enough to pickle into every task.
+    name: str
+    n_rows: int
+    columns: tuple[str, ...]
+    index_name: str | None
+
+    def frame(self, block: SharedMemory) -> pd.DataFrame:
+        # Zero-copy views over the block; pandas keeps the (columns, rows)
+        # array as its single float block instead of consolidating a copy.
+        dates = np.ndarray(self.n_rows, dtype="datetime64[ns]", buffer=block.buf)
+        values = np.ndarray((len(self.columns), self.n_rows), dtype=np.float64, buffer=block.buf, offset=8 * self.n_rows)
+        index = pd.DatetimeIndex(dates, name=self.index_name, copy=False)
+        return pd.DataFrame(values.T, index=index, columns=list(self.columns), copy=False)
+
+
+def _publish(history: pd.DataFrame) -> tuple[SharedMemory, SharedHistory]:
+    n_rows, n_columns = history.shape
+    block = SharedMemory(create=True, size=max(8 * n_rows * (n_columns + 1), 1))
+    spec = SharedHistory(block.name, n_rows, tuple(map(str, history.columns)), history.index.name)
+    np.ndarray(n_rows, dtype=np.int64, buffer=block.buf)[:] = history.index.to_numpy().astype("datetime64[ns]").view(np.int64)
+    values = np.ndarray((n_columns, n_rows), dtype=np.float64, buffer=block.buf, offset=8 * n_rows)
+    values[:] = history.to_numpy(dtype=np.float64).T
+    return block, spec
+
+
+@contextmanager
+def shared_histories(histories: Mapping[str, pd.DataFrame]) -> Iterator[dict[str, SharedHistory]]:
+    # Copy each symbol's frame into shared memory once; the blocks are
+    # unlinked on exit, so finish every task inside the `with`.
+    blocks: list[SharedMemory] = []
+    try:
+        specs = {}
+        for symbol, history in histories.items():
+            block, specs[symbol] = _publish(history)
+            blocks.append(block)
+        yield specs
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# The block a worker process is attached to, with the frame built over it.
+# Consecutive segments of one symbol reuse it; moving to another symbol
+# detaches first, so a worker holds at most one block at a time.
+_attached: dict[str, tuple[SharedMemory, pd.DataFrame]] = {}
+
+
+def _detach(name: str) -> None:
+    block, frame = _attached.pop(name)
+    del frame
+    try:
+        block.close()
+    except BufferError:
+        # Views from the last backtest can linger in reference cycles.
+        gc.collect()
+        block.close()
+
+
+def _detach_all() -> None:
+    for name in list(_attached):
+        _detach(name)
+
+
+def _init_worker() -> None:
+    # Runs as the worker process exits (multiprocessing finalizers run at
+    # process shutdown, atexit handlers do not).
+    util.Finalize(None, _detach_all, exitpriority=10)
+
+
+def _attach(spec: SharedHistory) -> pd.DataFrame:
+    if spec.name not in _attached:
+        _detach_all()
+        # Spawned workers share the parent's resource tracker, so attaching
+        # re-registers a name it already tracks and the parent's unlink
+        # still cleans up; a worker must not unregister it itself.
+        block = SharedMemory(spec.name)
+        _attached[spec.name] = block, spec.frame(block)
+    return _attached[spec.name][1]
+
+
+def _run_segment(
+    metrics_fn: Callable[[pd.DataFrame, str], tuple[pl.DataFrame, dict]],
+    source: SharedHistory | pd.DataFrame,
+    start: str,
+    end: str,
+    label: str,
+) -> tuple[pl.DataFrame, dict]:
+    history = _attach(source) if isinstance(source, SharedHistory) else source
+    return metrics_fn(history.loc[start:end], label)
+
+
+def run_segments(
+    histories: Mapping[str, pd.DataFrame],
+    segments: Segments,
+    metrics_fn: Callable[[pd.DataFrame, str], tuple[pl.DataFrame, dict]] = backtest_metrics,
+    cache: ResultCache | None = None,
+    depends_on: Iterable[Callable] = BACKTEST_DEPENDENCIES,
+    max_workers: int | None = None,
+    min_bars: int = SMACrossover.long_window,
+    executor: Executor | None = None,
+    parallel_min_segments: int = PARALLEL_MIN_SEGMENTS,
+) -> dict[str, tuple[pl.DataFrame, dict]]:
+    # metrics_fn(window, "SYMBOL • segment") for every segment of every
+    # symbol in `histories`, keyed by that label in segment order. Worker
+    # processes are spawned (see stress_grid._default_executor) and read the
+    # histories from shared memory, so each symbol is copied once rather
+    # than pickled into every task; notebook-defined metrics_fn run on
+    # threads over the frames themselves. With `cache`, hits are served in
+    # the parent under the same key cache.memoize(metrics_fn,
+    # depends_on=depends_on) uses, and only misses go to the pool.
+    # max_workers=0, or fewer than parallel_min_segments uncached segments
+    # without an explicit executor, runs inline. Windows shorter than
+    # min_bars are skipped.
+    depends_on = tuple(depends_on)
+    results: dict[str, tuple[pl.DataFrame, dict] | None] = {}
+    pending: list[tuple[str, str, str, str, str | None]] = []
+    for symbol, symbol_segments in segments.items():
+        history = histories.get(symbol)
+        if history is None:
+            print(f"Skipping {symbol}: no history")
+            continue
+        for segment_label, start, end in symbol_segments:
+            n_bars = len(history.loc[start:end])
+            if n_bars < min_bars:
+                print(f"Skipping {symbol} {segment_label}: {n_bars} observations (< {min_bars})")
+                continue
+            label = f"{symbol} • {segment_label}"
+            key = None
+            if cache is not None:
+                key = cache_key(metrics_fn, (history.loc[start:end], label), depends_on=depends_on)
+                found, value, _ = cache.get(key)
+                if found:
+                    cache.hits += 1
+                    results[label] = value
+                    continue
+                cache.misses += 1
+            results[label] = None
+            pending.append((symbol, start, end, label, key))
+
+    def store(label: str, key: str | None, value: tuple[pl.DataFrame, dict]) -> None:
+        results[label] = value
+        if cache is not None:
+            cache.put(key, value, {"function": function_identity(metrics_fn).split(":")[0]})
+
+    if executor is None and (max_workers == 0 or len(pending) < parallel_min_segments):
+        for symbol, start, end, label, key in pending:
+            store(label, key, _run_segment(metrics_fn, histories[symbol], start, end, label))
+    elif pending:
+        owned = executor is None
+        if owned:
+            workers = max_workers or min(len(pending), os.cpu_count() or 1)
+            if getattr(metrics_fn, "__module__", "__main__") == "__main__":
+                executor = ThreadPoolExecutor(max_workers=workers)
+            else:
+                executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker)
+        try:
+            # Threads already share the parent's frames.
+            symbols = dict.fromkeys(symbol for symbol, *_ in pending)
+            shared = isinstance(executor, ProcessPoolExecutor)
+            with shared_histories({s: histories[s] for s in symbols}) if shared else nullcontext(histories) as sources:
+                futures = [
+                    (label, key, executor.submit(_run_segment, metrics_fn, sources[symbol], start, end, label))
+                    for symbol, start, end, label, key in pending
+                ]
+                for label, key, future in futures:
+                    store(label, key, future.result())
+        finally:
+            if owned:
+                executor.shutdown(cancel_futures=True)
+    return results
+
@@ -0,0 +1,179 @@
+import math
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
+import polars as pl
+
+# Bars per shocked block in the streaming passes; only one block of the
+# shocked series exists at a time, whatever the base series length.
+BLOCK_SIZE = 1 << 20
+# Same Pareto tail as the notebook's inject_shocks always used.
+TAIL_INDEX = 3.0
+
+
+@dataclass(frozen=True)
+class ShockOverlay:
+    # Sparse crash overlay for a base return series of `length` bars: bar
+    # indices[i] loses magnitudes[i]. Indices are sorted and unique, so
+    # memory scales with the number of shocks, not the series length, and
+    # one base series can carry any number of overlays.
+    length: int
+    indices: np.ndarray
+    magnitudes: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.indices.nbytes + self.magnitudes.nbytes
+
+    def _check(self, returns: np.ndarray) -> None:
+        if len(returns) != self.length:
+            raise ValueError(f"Overlay covers {self.length} bars, returns have {len(returns)}")
+
+    def apply(self, returns: np.ndarray) -> np.ndarray:
+        # Dense shocked copy, for callers that need the whole array.
+        self._check(returns)
+        shocked = np.array(returns, dtype=float)
+        shocked[self.indices] -= self.magnitudes
+        return shocked
+
+    def blocks(self, returns: np.ndarray, block_size: int = BLOCK_SIZE) -> Iterator[tuple[int, np.ndarray]]:
+        # (start, shocked copy of returns[start:start + block_size]) in order;
+        # `returns` may be a memmap, only the current block is materialised.
+        self._check(returns)
+        bounds = np.searchsorted(self.indices, np.arange(0, self.length + block_size, block_size))
+        for b, start in enumerate(range(0, self.length, block_size)):
+            block = np.array(returns[start:start + block_size], dtype=float)
+            hits = slice(bounds[b], bounds[b + 1])
+            block[self.indices[hits] - start] -= self.magnitudes[hits]
+            yield start, block
+
+    def merged(self, other: "ShockOverlay") -> "ShockOverlay":
+        # Both overlays on the same base; shocks on the same bar add up.
+        if other.length != self.length:
+            raise ValueError(f"Overlays cover {self.length} and {other.length} bars")
+        indices, inverse = np.unique(np.concatenate([self.indices, other.indices]), return_inverse=True)
+        magnitudes = np.zeros(indices.size)
+        np.add.at(magnitudes, inverse, np.concatenate([self.magnitudes, other.magnitudes]))
+        return ShockOverlay(self.length, indices, magnitudes)
+
+    def scaled(self, factor: float) -> "ShockOverlay":
+        # Same crash dates, `factor` times the severity.
+        return ShockOverlay(self.length, self.indices, self.magnitudes * factor)
+
+
+def draw_shocks(
+    length: int,
+    shock_probability: float,
+    tail_scale: float,
+    generator: np.random.Generator,
+    tail_index: float = TAIL_INDEX,
+) -> ShockOverlay:
+    # Each bar is shocked with probability shock_probability, independently,
+    # as with a dense uniform mask; arrivals are drawn as geometric gaps
+    # between shocks instead, so the cost is O(shocks) rather than O(length).
+    if shock_probability <= 0 or length <= 0:
+        return ShockOverlay(max(length, 0), np.empty(0, dtype=np.int64), np.empty(0))
+    probability = min(shock_probability, 1.0)
+    arrivals: list[np.ndarray] = []
+    last = -1
+    while True:
+        expected = (length - 1 - last) * probability
+        gaps = generator.geometric(probability, int(expected + 4 * math.sqrt(expected)) + 16)
+        batch = last + np.cumsum(gaps)
+        inside = batch[batch < length]
+        arrivals.append(inside)
+        if inside.size < batch.size:
+            break
+        last = int(batch[-1])
+    indices = np.concatenate(arrivals).astype(np.int64)
+    return ShockOverlay(length, indices, generator.pareto(tail_index, indices.size) * tail_scale)
+
+
+def concat_overlays(overlays: Iterable[ShockOverlay]) -> ShockOverlay:
+    # Overlays of consecutive segments (e.g. regimes) as one for the joined series.
+    overlays = list(overlays)
+    offsets = np.cumsum([0] + [overlay.length for overlay in overlays])
+    return ShockOverlay(
+        int(offsets[-1]),
+        np.concatenate([np.empty(0, dtype=np.int64)] + [o.indices + offset for o, offset in zip(overlays, offsets)]),
+        np.concatenate([np.empty(0)] + [o.magnitudes for o in overlays]),
+    )
+
+
+def overlay_prices(returns: np.ndarray, overlay: ShockOverlay, start_price: float = 100.0, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    # returns_to_prices(overlay.apply(returns)) without the shocked copy.
+    prices = np.empty(overlay.length + 1)
+    prices[0] = level = start_price
+    for start, block in overlay.blocks(returns, block_size):
+        out = prices[start + 1:start + 1 + block.size]
+        np.cumprod(1 + block, out=out)
+        out *= level
+        level = out[-1]
+    return prices
+
+
+def overlay_equity(returns: np.ndarray, overlay: ShockOverlay, start: float = 1.0, block_size: int = BLOCK_SIZE) -> pl.Series:
+    # equity_curve of the shocked returns.
+    return pl.Series("equity", overlay_prices(returns, overlay, start, block_size)[1:])
+
+
+def overlay_metrics(
+    returns: np.ndarray,
+    overlay: ShockOverlay,
+    label: str,
+    periods_per_year: int = 252,
+    block_size: int = BLOCK_SIZE,
+) -> pl.DataFrame:
+    # strategy_metrics of the shocked returns in one streaming pass with
+    # O(block_size) memory. Variance merges per-block (count, mean, M2);
+    # the equity level is rescaled to its running peak after every block so
+    # billions of bars neither overflow nor change the drawdowns, and the
+    # dropped scale is kept as a log.
+    n = overlay.length
+    if n == 0:
+        return pl.DataFrame({"metric": [], "value": [], "label": []})
+    count, mean, m2 = 0, 0.0, 0.0
+    wins = 0
+    level, peak, log_scale = 1.0, -math.inf, 0.0
+    max_dd = math.inf
+    for _, block in overlay.blocks(returns, block_size):
+        block_mean = float(block.mean())
+        block_m2 = float(np.square(block - block_mean).sum())
+        total = count + block.size
+        delta = block_mean - mean
+        m2 += block_m2 + delta * delta * count * block.size / total
+        mean += delta * block.size / total
+        count = total
+        wins += int(np.count_nonzero(block > 0))
+
+        equity = level * np.cumprod(1 + block)
+        running = np.maximum(np.maximum.accumulate(equity), peak)
+        max_dd = min(max_dd, float((equity / running - 1).min()))
+        level, peak = float(equity[-1]), float(running[-1])
+        if 0 < peak < math.inf:
+            log_scale += math.log(peak)
+            level, peak = level / peak, 1.0
+
+    if level > 0:
+        log_equity = math.log(level) + log_scale
+        total_return = math.expm1(log_equity)
+        ann_return = math.expm1(log_equity * periods_per_year / n)
+    else:
+        total_return = level * math.exp(log_scale) - 1.0
+        ann_return = float('nan')
+    ann_vol = math.sqrt(periods_per_year * m2 / (n - 1)) if n > 1 else float('nan')
+    sharpe = ann_return / ann_vol if ann_vol > 0 and math.isfinite(ann_return) else float('nan')
+
+    return pl.DataFrame({
+        "metric": [
+            "Total return",
+            "Annualized return",
+            "Annualized vol",
+            "Sharpe",
+            "Max drawdown",
+            "Hit rate",
+        ],
+        "value": [total_return, ann_return, ann_vol, sharpe, max_dd, wins / n],
+        "label": [label] * 6,
+    })
@@ -0,0 +1,173 @@
+import math
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
+
+CROSS_ABOVE = 1
+CROSS_BELOW = -1
+NO_CROSS = 0
+
+# Bars per cumulative-sum block in update_many; keeps the running sums small
+# enough that float64 rounding stays well below a basis point of an SMA.
+BLOCK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class CrossoverSnapshot:
+    short_window: int
+    long_window: int
+    window: tuple[float, ...]  # last `long_window` prices, oldest first
+    count: int
+    prev_short: float
+    prev_long: float
+    signal: int
+
+
+@dataclass
+class CrossoverBatch:
+    sma_short: np.ndarray
+    sma_long: np.ndarray
+    signal: np.ndarray
+    events: np.ndarray
+
+
+class SMACrossoverEngine:
+    # Incremental SMA crossover: ring buffer of the last `long_window` prices
+    # plus running sums for both windows, so each new bar costs O(1). Events
+    # follow crossed_above/crossed_below: both SMAs must exist on the previous
+    # and current bar, and a cross is `prev <= / >= prev` then strict.
+    def __init__(self, short_window: int = 20, long_window: int = 100):
+        if not 0 < short_window <= long_window:
+            raise ValueError(f"Need 0 < short_window <= long_window, got {short_window} and {long_window}")
+        self.short_window = short_window
+        self.long_window = long_window
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer = [0.0] * self.long_window
+        self._count = 0
+        self._sum_short = 0.0
+        self._sum_long = 0.0
+        self.sma_short = math.nan
+        self.sma_long = math.nan
+        self.signal = 0
+
+    @property
+    def bars(self) -> int:
+        return self._count
+
+    def _window(self) -> list[float]:
+        n = min(self._count, self.long_window)
+        start = (self._count - n) % self.long_window
+        ordered = self._buffer[start:] + self._buffer[:start]
+        # During warm-up slots [0, n) hold the prices seen so far.
+        return ordered[:n]
+
+    def _resum(self) -> None:
+        # Running sums drift by one rounding error per bar; re-add the buffer
+        # once per wrap so the error stays bounded (amortised O(1)).
+        window = self._window()
+        self._sum_long = math.fsum(window)
+        self._sum_short = math.fsum(window[-self.short_window:])
+
+    def update(self, price: float) -> int:
+        short_w, long_w = self.short_window, self.long_window
+        buffer, count = self._buffer, self._count
+        slot = count % long_w
+        if count >= long_w:
+            self._sum_long -= buffer[slot]
+        if count >= short_w:
+            self._sum_short -= buffer[(count - short_w) % long_w]
+        price = float(price)
+        buffer[slot] = price
+        self._sum_long += price
+        self._sum_short += price
+        self._count = count = count + 1
+        if slot == long_w - 1:
+            self._resum()
+
+        prev_short, prev_long = self.sma_short, self.sma_long
+        self.sma_short = self._sum_short / short_w if count >= short_w else math.nan
+        self.sma_long = self._sum_long / long_w if count >= long_w else math.nan
+        if count < long_w:
+            return NO_CROSS
+
+        self.signal = int(self.sma_short > self.sma_long)
+        if count == long_w:
+            return NO_CROSS
+        if prev_short <= prev_long and self.sma_short > self.sma_long:
+            return CROSS_ABOVE
+        if prev_short >= prev_long and self.sma_short < self.sma_long:
+            return CROSS_BELOW
+        return NO_CROSS
+
+    def update_many(self, prices: Iterable[float]) -> CrossoverBatch:
+        # Vectorised equivalent of calling update() per bar: rolling sums come
+        # from block-wise cumulative sums seeded with the carried window.
+        prices = np.asarray(prices, dtype=float).ravel()
+        sma_short = np.empty(prices.size)
+        sma_long = np.empty(prices.size)
+        for start in range(0, prices.size, BLOCK_SIZE):
+            block = prices[start:start + BLOCK_SIZE]
+            carried = np.asarray(self._window(), dtype=float)
+            ext = np.concatenate([carried, block])
+            csum = np.concatenate([[0.0], np.cumsum(ext)])
+            end = np.arange(carried.size + 1, ext.size + 1)
+            seen = self._count + np.arange(1, block.size + 1)
+            for out, w in ((sma_short, self.short_window), (sma_long, self.long_window)):
+                lo = np.maximum(end - w, 0)
+                out[start:start + block.size] = np.where(seen >= w, (csum[end] - csum[lo]) / w, np.nan)
+
+            tail = ext[-self.long_window:]
+            self._count += block.size
+            self._buffer = [0.0] * self.long_window
+            for offset, value in enumerate(tail):
+                self._buffer[(self._count - tail.size + offset) % self.long_window] = float(value)
+            self._resum()
+
+        prev_short = np.concatenate([[self.sma_short], sma_short[:-1]])
+        prev_long = np.concatenate([[self.sma_long], sma_long[:-1]])
+        # NaN comparisons are False, so warm-up bars never emit events.
+        above = (prev_short <= prev_long) & (sma_short > sma_long)
+        below = (prev_short >= prev_long) & (sma_short < sma_long)
+        events = np.where(above, CROSS_ABOVE, np.where(below, CROSS_BELOW, NO_CROSS)).astype(np.int8)
+        signal = (sma_short > sma_long).astype(np.int8)
+
+        if prices.size:
+            self.sma_short = float(sma_short[-1])
+            self.sma_long = float(sma_long[-1])
+            if self._count >= self.long_window:
+                self.signal = int(signal[-1])
+        return CrossoverBatch(sma_short=sma_short, sma_long=sma_long, signal=signal, events=events)
+
+    def stream(self, prices: Iterable[float]) -> Iterator[tuple[int, int]]:
+        # Drive the engine from a live or replayed feed; yields (bar, event)
+        # for every bar that crosses.
+        for price in prices:
+            event = self.update(price)
+            if event:
+                yield self._count - 1, event
+
+    def snapshot(self) -> CrossoverSnapshot:
+        return CrossoverSnapshot(
+            short_window=self.short_window,
+            long_window=self.long_window,
+            window=tuple(self._window()),
+            count=self._count,
+            prev_short=self.sma_short,
+            prev_long=self.sma_long,
+            signal=self.signal,
+        )
+
+    @classmethod
+    def restore(cls, snapshot: CrossoverSnapshot) -> "SMACrossoverEngine":
+        engine = cls(snapshot.short_window, snapshot.long_window)
+        engine._count = snapshot.count
+        for offset, value in enumerate(snapshot.window):
+            engine._buffer[(snapshot.count - len(snapshot.window) + offset) % snapshot.long_window] = value
+        engine._resum()
+        engine.sma_short = snapshot.prev_short
+        engine.sma_long = snapshot.prev_long
+        engine.signal = snapshot.signal
+        return engine
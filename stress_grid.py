@@ -0,0 +1,159 @@
+import itertools
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+import polars as pl
+import pyarrow.feather as feather
+
+from result_cache import function_identity, stable_hash
+
+TASK_KEY = "task_key"
+
+
+def grid_tasks(where: Callable[[dict], bool] | None = None, **axes: Iterable) -> list[dict]:
+    # Cross product of named axes, e.g. grid_tasks(scenario=[...], seed=range(50),
+    # short_window=[10, 20], long_window=[50, 100], where=lambda t: t["short_window"] < t["long_window"]).
+    names = list(axes)
+    tasks = [dict(zip(names, values)) for values in itertools.product(*(list(axes[name]) for name in names))]
+    return [task for task in tasks if where is None or where(task)]
+
+
+class ResultsStore:
+    # Append-only columnar store: every flush writes a new Arrow IPC part file
+    # (written to a hidden temp name, then renamed), so a crash can lose at
+    # most the unflushed rows and never corrupts finished ones.
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def parts(self) -> list[Path]:
+        return sorted(self.directory.glob("part-*.arrow"))
+
+    def completed(self) -> set[str]:
+        keys: set[str] = set()
+        for part in self.parts():
+            keys.update(feather.read_table(part, columns=[TASK_KEY], memory_map=True).column(TASK_KEY).to_pylist())
+        return keys
+
+    def append(self, rows: list[dict]) -> Path | None:
+        if not rows:
+            return None
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.arrow"
+        staging = self.directory / f".{name}"
+        pl.DataFrame(rows).write_ipc(staging, compression="uncompressed")
+        os.replace(staging, self.directory / name)
+        return self.directory / name
+
+    def load(self) -> pl.DataFrame:
+        parts = self.parts()
+        if not parts:
+            return pl.DataFrame()
+        frames = [pl.from_arrow(feather.read_table(part, memory_map=True)) for part in parts]
+        # A crash mid-compact can leave a task in two parts; keep the newest.
+        return pl.concat(frames, how="diagonal_relaxed").unique(subset=TASK_KEY, keep="last", maintain_order=True)
+
+    def compact(self) -> None:
+        # Merge many small part files into one; the old parts are removed only
+        # after the merged file is in place.
+        parts = self.parts()
+        if len(parts) > 1:
+            self.append(self.load().to_dicts())
+            for part in parts:
+                part.unlink()
+
+
+def _run_task(task_fn: Callable[[dict], Mapping[str, Any]], task: dict) -> dict:
+    result = task_fn(task)
+    if isinstance(result, pl.DataFrame):
+        # strategy_metrics output: one column per metric.
+        result = dict(zip(result["metric"].to_list(), result["value"].to_list()))
+    return dict(result)
+
+
+def _default_executor(task_fn: Callable, max_workers: int | None) -> Executor:
+    # fork deadlocks once polars' thread pool is running, so worker processes
+    # are spawned. Spawned workers can only import module-level functions;
+    # tasks defined in the notebook run on threads instead (numpy and polars
+    # release the GIL for the heavy lifting).
+    if getattr(task_fn, "__module__", "__main__") == "__main__":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_grid(
+    task_fn: Callable[[dict], Mapping[str, Any]],
+    tasks: Iterable[dict],
+    store: ResultsStore | str | os.PathLike,
+    context: Any = None,
+    max_workers: int | None = None,
+    flush_every: int = 1,
+    executor: Executor | None = None,
+) -> pl.DataFrame:
+    # Run `task_fn(task)` for every task not already in `store` on a worker
+    # pool, appending each result as it lands. Each task is keyed on task_fn's
+    # source, `context` (e.g. the Regime lists a scenario name refers to) and
+    # the task's parameters, so editing any of them reruns exactly the
+    # affected tasks. max_workers=0 runs inline.
+    store = store if isinstance(store, ResultsStore) else ResultsStore(store)
+    identity = function_identity(task_fn)
+    context_hash = stable_hash(context)
+    done = store.completed()
+    pending = [(stable_hash(identity, context_hash, task), task) for task in tasks]
+    keys = [key for key, _ in pending]
+    total = len(pending)
+    pending = [(key, task) for key, task in pending if key not in done]
+    skipped = total - len(pending)
+
+    buffer: list[dict] = []
+    failures = 0
+
+    def finish(key: str, task: dict, outcome: Callable[[], dict]) -> None:
+        nonlocal failures
+        try:
+            metrics = outcome()
+        except Exception as exc:
+            failures += 1
+            print(f"Task {task} failed: {type(exc).__name__}: {exc}")
+            return
+        buffer.append({TASK_KEY: key, **task, **metrics})
+        if len(buffer) >= flush_every:
+            store.append(buffer)
+            buffer.clear()
+
+    try:
+        if max_workers == 0 and executor is None:
+            for key, task in pending:
+                finish(key, task, lambda: _run_task(task_fn, task))
+        else:
+            owned = executor is None
+            if owned:
+                executor = _default_executor(task_fn, max_workers)
+            try:
+                # Keep a bounded number of tasks in flight so huge grids are
+                # not materialised as futures all at once.
+                limit = 4 * (max_workers or os.cpu_count() or 1)
+                queue = iter(pending)
+                in_flight: dict[Future, tuple[str, dict]] = {}
+                for key, task in itertools.islice(queue, limit):
+                    in_flight[executor.submit(_run_task, task_fn, task)] = (key, task)
+                while in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        key, task = in_flight.pop(future)
+                        finish(key, task, future.result)
+                        for next_key, next_task in itertools.islice(queue, 1):
+                            in_flight[executor.submit(_run_task, task_fn, next_task)] = (next_key, next_task)
+            finally:
+                if owned:
+                    executor.shutdown(cancel_futures=True)
+    finally:
+        store.append(buffer)
+
+    print(f"{total} tasks: {total - skipped - failures} run, {skipped} already done, {failures} failed")
+    results = store.load()
+    return results.filter(pl.col(TASK_KEY).is_in(keys)) if results.height else results
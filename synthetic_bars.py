@@ -0,0 +1,105 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from market_data import OHLCV
+
+
+def _ewma(values: np.ndarray, span: int) -> np.ndarray:
+    # EWMA along time for every path at once, seeded with each path's first
+    # observation so no bar depends on later ones.
+    alpha = 2 / (span + 1)
+    initial = (1 - alpha) * values[:, :1]
+    smoothed, _ = lfilter([alpha], [1, alpha - 1], values, axis=1, zi=initial)
+    return smoothed
+
+
+def synthetic_ohlcv(
+    returns: np.ndarray,
+    start_price: float = 100.0,
+    overnight_share: float = 0.2,
+    vol_span: int = 20,
+    base_volume: float = 1e6,
+    volume_noise: float = 0.3,
+    volume_beta: float = 0.5,
+    min_return: float = -0.95,
+    generator: np.random.Generator | None = None,
+) -> dict[str, np.ndarray]:
+    # Intrabar OHLCV for a series or a (paths, time) matrix of simple
+    # close-to-close returns; every output has the input's shape. Closes
+    # follow returns_to_prices exactly (bar t closes the t-th return, and
+    # start_price is the close before bar 0, so bar 0 gaps from it like any
+    # other bar). High/Low are sampled as the extremes of a
+    # Brownian bridge from Open to Close over the session, with volatility
+    # from an EWMA of squared log returns so bars widen in volatile regimes. Volume is
+    # lognormal and rises with the size of the move relative to that vol.
+    # Returns below min_return are floored so prices stay positive.
+    generator = generator or np.random.default_rng()
+    arr = np.asarray(returns, dtype=float)
+    squeeze = arr.ndim == 1
+    if squeeze:
+        arr = arr[None, :]
+    log_returns = np.log1p(np.maximum(arr, min_return))
+    sigma = np.sqrt(np.maximum(_ewma(np.square(log_returns), vol_span), 1e-12))
+
+    log_close = np.log(start_price) + np.cumsum(log_returns, axis=1)
+    log_prev = np.empty_like(log_close)
+    log_prev[:, 0] = np.log(start_price)
+    log_prev[:, 1:] = log_close[:, :-1]
+
+    # The open is the overnight_share point of a Brownian bridge from the
+    # previous close to this close; the rest of the bridge is the session.
+    tau = overnight_share
+    gap = tau * log_returns + np.sqrt(tau * (1 - tau)) * sigma * generator.standard_normal(arr.shape)
+    log_open = log_prev + gap
+    # Max/min of a Brownian bridge from a to b with variance s2 over the bar:
+    # (a + b +/- sqrt((b - a)^2 - 2 s2 log U)) / 2 for U ~ Uniform(0, 1].
+    intraday_var = (1 - overnight_share) * np.square(sigma)
+    span = np.square(log_close - log_open)
+    up = np.sqrt(span - 2 * intraday_var * np.log1p(-generator.random(arr.shape)))
+    down = np.sqrt(span - 2 * intraday_var * np.log1p(-generator.random(arr.shape)))
+    log_high = (log_open + log_close + up) / 2
+    log_low = (log_open + log_close - down) / 2
+
+    surprise = np.abs(log_returns) / sigma
+    volume = base_volume * np.exp(volume_noise * generator.standard_normal(arr.shape) - volume_noise**2 / 2) * (1 + volume_beta * surprise)
+
+    bars = {
+        "Open": np.exp(log_open),
+        "High": np.exp(log_high),
+        "Low": np.exp(log_low),
+        "Close": np.exp(log_close),
+        "Volume": np.rint(volume),
+    }
+    return {name: values[0] for name, values in bars.items()} if squeeze else bars
+
+
+def ohlcv_frames(
+    bars: dict[str, np.ndarray],
+    names: Iterable[str] | None = None,
+    start: str = "2000-01-03",
+    freq: str = "B",
+) -> dict[str, pd.DataFrame]:
+    # One backtesting.py-ready frame per path, on a shared datetime index
+    # (business days by default; any pandas frequency works, e.g. "5min").
+    closes = np.atleast_2d(bars["Close"])
+    names = list(names) if names is not None else [f"SYN{i}" for i in range(closes.shape[0])]
+    if len(names) != closes.shape[0]:
+        raise ValueError(f"Got {len(names)} names for {closes.shape[0]} paths")
+    index = pd.date_range(start, periods=closes.shape[1], freq=freq, name="Date")
+    columns = {column: np.atleast_2d(bars[column]) for column in OHLCV}
+    return {name: pd.DataFrame({column: columns[column][i] for column in OHLCV}, index=index) for i, name in enumerate(names)}
+
+
+def synthetic_histories(
+    returns: np.ndarray,
+    names: Iterable[str] | None = None,
+    start: str = "2000-01-03",
+    freq: str = "B",
+    **kwargs,
+) -> dict[str, pd.DataFrame]:
+    # Same shape as fetch_histories' output, so offline universes drop into
+    # the section 6 loop; kwargs go to synthetic_ohlcv.
+    return ohlcv_frames(synthetic_ohlcv(returns, **kwargs), names=names, start=start, freq=freq)
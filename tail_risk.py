@@ -0,0 +1,92 @@
+import numpy as np
+import polars as pl
+
+
+def _label(level: float) -> str:
+    return f"{level * 100:g}%"
+
+
+def _tail_sizes(n: int, levels: tuple[float, ...]) -> list[int]:
+    # Historical VaR at level a is the k-th worst return with k = ceil(n * (1 - a));
+    # ES is the mean of those k worst returns. Both are reported as positive losses.
+    for level in levels:
+        if not 0 < level < 1:
+            raise ValueError(f"VaR level must be in (0, 1), got {level}")
+    return [max(int(np.ceil(n * (1 - level) - 1e-9)), 1) for level in levels]
+
+
+class _LowestK:
+    # The k smallest returns of every path's trailing window, kept sorted.
+    # A new bar below the current k-th smallest is merged in and pushes the
+    # largest out; only when a bar inside the buffer leaves the window is
+    # that path rebuilt from its window, which happens on roughly k / window
+    # of the steps. Everything else is (paths, k) work per bar.
+    def __init__(self, windows: np.ndarray, k: int):
+        self.k = k
+        self.lowest = self._select(windows)
+
+    def _select(self, windows: np.ndarray) -> np.ndarray:
+        return np.sort(np.partition(windows, self.k - 1, axis=1)[:, :self.k], axis=1)
+
+    def slide(self, returns: np.ndarray, t: int, window: int) -> np.ndarray:
+        lowest = self.lowest
+        outgoing, incoming = returns[:, t - window], returns[:, t]
+        rebuild = outgoing <= lowest[:, -1]
+        merge = ~rebuild & (incoming < lowest[:, -1])
+        if merge.any():
+            rows, value = lowest[merge], incoming[merge, None]
+            # Slot j keeps rows[j] while it is below the new value, else takes
+            # max(rows[j - 1], value): the value lands once, the old max drops.
+            shifted = np.concatenate([np.full_like(value, -np.inf), rows[:, :-1]], axis=1)
+            lowest[merge] = np.where(rows < value, rows, np.maximum(shifted, value))
+        if rebuild.any():
+            rows = np.flatnonzero(rebuild)
+            lowest[rows] = self._select(returns[rows, t - window + 1:t + 1])
+        return lowest
+
+
+def rolling_var_es(returns: np.ndarray, window: int = 250, levels: tuple[float, ...] = (0.95, 0.99)) -> dict[str, np.ndarray]:
+    # Rolling historical VaR and expected shortfall over trailing windows of
+    # a series or a (paths, time) matrix. Each output has the input's shape;
+    # entry t covers bars t - window + 1 .. t and is NaN until a full window
+    # exists. Windows are never sorted: each path carries only its tail order
+    # statistics forward from bar to bar (see _LowestK).
+    arr = np.asarray(returns, dtype=float)
+    squeeze = arr.ndim == 1
+    if squeeze:
+        arr = arr[None, :]
+    if not np.isfinite(arr).all():
+        raise ValueError("Returns must be finite")
+    levels = tuple(levels)
+    tails = _tail_sizes(window, levels)
+    depth = max(tails)
+    # Filled one bar at a time, so stored time-major and transposed at the end.
+    out = {}
+    for level in levels:
+        out[f"VaR {_label(level)}"] = np.full(arr.shape[::-1], np.nan)
+        out[f"ES {_label(level)}"] = np.full(arr.shape[::-1], np.nan)
+
+    n_steps = arr.shape[1]
+    if n_steps >= window:
+        tail = _LowestK(arr[:, :window], depth)
+        lowest = tail.lowest
+        for t in range(window - 1, n_steps):
+            if t >= window:
+                lowest = tail.slide(arr, t, window)
+            worst = np.cumsum(lowest, axis=1)
+            for level, k in zip(levels, tails):
+                np.negative(lowest[:, k - 1], out=out[f"VaR {_label(level)}"][t])
+                np.divide(worst[:, k - 1], -k, out=out[f"ES {_label(level)}"][t])
+    return {name: values[:, 0] if squeeze else np.ascontiguousarray(values.T) for name, values in out.items()}
+
+
+def tail_metrics(simple_returns: pl.Series, label: str, levels: tuple[float, ...] = (0.95, 0.99)) -> pl.DataFrame:
+    # Full-sample historical VaR/ES in strategy_metrics' layout, so the rows
+    # can be concatenated onto the six headline metrics.
+    arr = simple_returns.drop_nulls().to_numpy()
+    arr = np.sort(arr[np.isfinite(arr)])
+    names, values = [], []
+    for level, k in zip(levels, _tail_sizes(arr.size, levels)):
+        names += [f"VaR {_label(level)}", f"ES {_label(level)}"]
+        values += [-float(arr[k - 1]), -float(arr[:k].mean())] if arr.size else [float("nan")] * 2
+    return pl.DataFrame({"metric": names, "value": values, "label": [label] * len(names)})
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from adaptive_mc import CellEstimate, adaptive_monte_carlo
+from path_rng import draw_paths
+from payoffs import PointwisePayoff, price_payoffs
+
+
+def test_batched_moments_match_the_full_sample():
+    values = np.random.default_rng(2).standard_t(3, 5_000)
+    cell = CellEstimate()
+    for batch in np.array_split(values, [10, 11, 900, 3000]):
+        cell.update(batch)
+    assert cell.count == values.size
+    assert cell.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert cell.std == pytest.approx(values.std(ddof=1), rel=1e-12)
+    estimate, low, high = cell.quantile_intervals()[0.05]
+    assert low <= estimate <= high
+    assert estimate == np.quantile(values, 0.05)
+
+
+CONVEX = {"convex": PointwisePayoff(lambda x: np.exp(8 * x) - 1)}
+
+
+def sampler(name: str, scale: float):
+    return lambda paths: draw_paths(name, paths, lambda generator: scale * generator.standard_t(3, 20))
+
+
+def test_noisy_cells_get_more_paths_and_samples_are_reproducible():
+    run = adaptive_monte_carlo(
+        {"calm": sampler("calm", 0.001), "wild": sampler("wild", 0.05)},
+        CONVEX,
+        rtol=0.05,
+        min_paths=500,
+        max_paths=20_000,
+    )
+    summary = {row["regime"]: row for row in run.summary.iter_rows(named=True)}
+    assert summary["wild"]["paths"] > summary["calm"]["paths"] >= 500
+    assert summary["calm"]["converged"]
+    assert summary["wild"]["paths"] <= 20_000
+
+    # A cell's samples are paths 0..n-1 of its sampler, so any can be redrawn.
+    calm = run.samples.filter(regime="calm")
+    redrawn = price_payoffs(sampler("calm", 0.001)(slice(0, calm.height)), CONVEX)
+    np.testing.assert_allclose(calm["total"].to_numpy(), redrawn["convex"].to_numpy())
+    assert calm["path"].to_list() == list(range(calm.height))
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from downsample import downsample, fan_bands, lttb, minmax_envelope
+
+
+def walk_with_spikes(n: int = 100_000) -> np.ndarray:
+    values = np.cumsum(np.random.default_rng(7).normal(0, 1, n))
+    values[31_337] += 500
+    values[77_777] -= 500
+    return values
+
+
+def test_lttb_keeps_the_endpoints_and_extremes():
+    values = walk_with_spikes()
+    index, kept = lttb(values, 500)
+    assert index.size == 500
+    assert index[0] == 0 and index[-1] == values.size - 1
+    assert np.all(np.diff(index) > 0)
+    assert {int(values.argmax()), int(values.argmin())} <= set(index.tolist())
+    np.testing.assert_array_equal(kept, values[index])
+
+
+def test_minmax_envelope_keeps_every_bucket_extreme():
+    values = walk_with_spikes()
+    values[50_000:50_500] = np.nan
+    index, kept = minmax_envelope(values, 1_000)
+    assert index.size <= 1_000
+    assert np.nanmax(kept) == np.nanmax(values) and np.nanmin(kept) == np.nanmin(values)
+    assert np.isnan(kept).any()
+
+
+def test_short_series_and_unknown_methods():
+    values = np.arange(10.0)
+    for method in ["minmax", "lttb"]:
+        index, kept = downsample(values, 100, method)
+        np.testing.assert_array_equal(kept, values)
+    assert downsample(values, None)[0].size == 10
+    with pytest.raises(ValueError):
+        downsample(values, 5, "every-nth")
+
+
+def test_fan_bands_only_widen():
+    paths = np.cumsum(np.random.default_rng(8).normal(0, 1, (200, 5_000)), axis=1)
+    quantiles = (0.05, 0.5, 0.95)
+    x, bands = fan_bands(paths, quantiles, max_points=100)
+    exact = np.quantile(paths, quantiles, axis=0).reshape(3, 100, 50)
+    assert x.size == 100
+    np.testing.assert_allclose(bands[0], exact[0].min(axis=1))
+    np.testing.assert_allclose(bands[1], exact[1].mean(axis=1))
+    np.testing.assert_allclose(bands[2], exact[2].max(axis=1))
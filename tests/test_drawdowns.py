@@ -0,0 +1,27 @@
+import numpy as np
+import polars as pl
+
+from drawdowns import EPISODE_SCHEMA, drawdown_episodes, drawdown_summary
+
+
+def test_episodes_match_a_hand_worked_path():
+    # Equity 1.1, 0.99, 1.089, 1.2, 1.08: one recovered episode from a peak
+    # of 1.1 (bars 1-2, back above at bar 3) and one open at the end.
+    returns = np.array([0.1, -0.1, 0.1, 1.2 / 1.089 - 1, -0.1])
+    episodes = drawdown_episodes(returns)
+    assert episodes.schema == pl.Schema(EPISODE_SCHEMA)
+    assert episodes["start"].to_list() == [1, 4]
+    assert episodes["trough"].to_list() == [1, 4]
+    assert episodes["recovery"].to_list() == [3, None]
+    assert episodes["time_under_water"].to_list() == [2, 1]
+    np.testing.assert_allclose(episodes["depth"].to_numpy(), [-0.1, -0.1])
+
+
+def test_no_drawdowns():
+    rising = np.full((3, 50), 0.01)
+    episodes = drawdown_episodes(rising)
+    assert episodes.height == 0
+    assert episodes.schema == pl.Schema(EPISODE_SCHEMA)
+    summary = drawdown_summary(episodes)
+    assert summary["metric"].to_list() == ["Depth", "Worst depth per path", "Duration (bars)", "Time under water (bars)"]
+    assert summary.drop("metric").null_count().row(0) == (4,) * (summary.width - 1)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from galton_geometry import ALPHA, BETA, ROWS, ball_experiment
+from galton_raster import BALL_COLORS, Board, Canvas, render_frames, simulate_board
+from path_rng import path_generator
+
+
+@pytest.mark.parametrize("kind", ["normal", "lognormal", "pareto"])
+def test_balls_follow_their_keyed_turns(kind):
+    board = Board(kind)
+    run = simulate_board(board, 50)
+    for ball in [0, 17, 49]:
+        turns = path_generator(ball_experiment(kind), ball).random(ROWS)
+        col = 0
+        for row in range(ROWS):
+            col += turns[row] < board.right_probability(row, col)
+        assert run.bins[ball] == col
+    # Waypoints end over the landing bin, stacked one slot per earlier ball there.
+    np.testing.assert_allclose(run.waypoints[:, -1, 0], board.x(run.bins - ROWS / 2), rtol=1e-6)
+    for b in np.unique(run.bins):
+        heights = run.waypoints[run.bins == b, -1, 1]
+        np.testing.assert_allclose(np.diff(heights), run.stack_scale, rtol=1e-5)
+
+
+@pytest.mark.parametrize("kind, mean", [("normal", ROWS / 2), ("pareto", ROWS * ALPHA / (ALPHA + BETA))])
+def test_bin_distribution(kind, mean):
+    # Binomial for the normal board, beta-binomial (Polya urn) for Pareto.
+    run = simulate_board(Board(kind), 20_000)
+    assert run.bins.mean() == pytest.approx(mean, abs=0.05)
+    assert run.counts.sum() == 20_000
+
+
+def test_frames_settle_once_every_ball_has_landed():
+    board = Board("normal")
+    run = simulate_board(board, 40)
+    canvas = Canvas(160, 90)
+    frames = list(render_frames(run, canvas, fps=10, drop_seconds=2.0, hold_seconds=1.0))
+    assert len(frames) == 50
+    assert all(frame.shape == (90, 160, 3) and frame.dtype == np.uint8 for frame in frames)
+    ball_pixels = [(frame == BALL_COLORS["normal"]).all(axis=2).sum() for frame in frames]
+    assert ball_pixels[0] <= ball_pixels[-1]
+    assert ball_pixels[-1] == ball_pixels[-2] > 0
+
+
+def test_odd_frame_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        Canvas(161, 90)
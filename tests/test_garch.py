@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pytest
+
+from garch import EGarch, GJRGarch, simulate_garch
+from path_rng import path_generator
+
+
+def test_gjr_returns_have_the_unconditional_variance():
+    model = GJRGarch(omega=1e-5, alpha=0.04, gamma=0.04, beta=0.85, df=8.0)
+    returns, _ = simulate_garch(model, 4_000, 500, burn_in=100, generator=np.random.default_rng(0))
+    assert model.long_run_variance == pytest.approx(1e-5 / 0.09)
+    assert returns.var() == pytest.approx(model.long_run_variance, rel=0.05)
+
+
+@pytest.mark.parametrize("model", [GJRGarch(shock_probability=0.02, shock_scale=0.05), EGarch(shock_probability=0.02, shock_scale=0.05)])
+def test_recursion_matches_a_scalar_loop(model):
+    returns, vols = simulate_garch(model, [3], 300, burn_in=20, experiment="garch")
+    keyed, _ = simulate_garch(model, 5, 300, burn_in=20, chunk_paths=2, experiment="garch")
+    np.testing.assert_array_equal(keyed[3], returns[0])
+
+    # Draws in _draws' order from path 3's keyed generator.
+    generator = path_generator("garch", 3)
+    z = generator.standard_t(model.df, (1, 320))[0] * math.sqrt((model.df - 2) / model.df)
+    hit = generator.random((1, 320))[0] < model.shock_probability
+    jumps = np.zeros(320)
+    jumps[hit] = generator.pareto(3.0, hit.sum()) * model.shock_scale
+    variance = model.long_run_variance
+    expected_returns, expected_vols = [], []
+    for t in range(320):
+        vol = math.sqrt(variance)
+        shock = vol * z[t] - jumps[t]
+        expected_returns.append(shock + model.mu)
+        expected_vols.append(vol)
+        if isinstance(model, GJRGarch):
+            variance = model.omega + (model.alpha + model.gamma * (shock < 0)) * shock**2 + model.beta * variance
+        else:
+            e = shock / vol
+            variance = math.exp(model.omega + model.alpha * (abs(e) - model.mean_abs_innovation) + model.gamma * e + model.beta * math.log(variance))
+    np.testing.assert_allclose(returns[0], expected_returns[20:], rtol=1e-10)
+    np.testing.assert_allclose(vols[0], expected_vols[20:], rtol=1e-10)
+
+
+def test_egarch_mean_abs_innovation_and_stationarity_checks():
+    model = EGarch(df=6.0)
+    z = np.random.default_rng(1).standard_t(6.0, 2_000_000) * math.sqrt(4 / 6)
+    assert model.mean_abs_innovation == pytest.approx(np.abs(z).mean(), rel=0.005)
+    with pytest.raises(ValueError):
+        GJRGarch(alpha=0.1, gamma=0.2, beta=0.85)
+    with pytest.raises(ValueError):
+        EGarch(beta=1.0)
+    with pytest.raises(ValueError):
+        simulate_garch(GJRGarch(df=2.0), 1, 10)
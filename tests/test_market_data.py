@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import OHLCV, FetchError, RateLimiter, RecordedCandleServer, fetch_histories, fetch_histories_async
+
+# ^GSPC and EURUSD=X only reach the server intact if the path is decoded.
+SYMBOLS = ["SPY", "BTC-USD", "^GSPC", "EURUSD=X", "BRK.B", "QQQ"]
+
+
+def candles(seed: int, n_bars: int = 300) -> pd.DataFrame:
+    generator = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + generator.normal(0, 0.01, n_bars))
+    frame = pd.DataFrame(
+        {
+            "Open": close * (1 + generator.normal(0, 0.002, n_bars)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": generator.integers(1_000, 1_000_000, n_bars),
+        },
+        index=pd.bdate_range("2020-01-01", periods=n_bars, name="Date"),
+    )
+    return frame
+
+
+@pytest.fixture
+def recorded():
+    return {symbol: candles(seed) for seed, symbol in enumerate(SYMBOLS)}
+
+
+def test_fetches_universe_concurrently(recorded):
+    latency = 0.2
+    with RecordedCandleServer(recorded, latency=latency) as server:
+        started = time.monotonic()
+        histories = fetch_histories(SYMBOLS, start="2019-01-01", base_url=server.base_url, max_connections=len(SYMBOLS), requests_per_second=0)
+        elapsed = time.monotonic() - started
+    assert list(histories) == SYMBOLS
+    assert server.requests == len(SYMBOLS)
+    # One round of latency, not one per symbol.
+    assert elapsed < latency * len(SYMBOLS) / 2
+    for symbol, history in histories.items():
+        expected = recorded[symbol]
+        np.testing.assert_allclose(history[OHLCV[:4]].to_numpy(), expected[OHLCV[:4]].to_numpy())
+        np.testing.assert_array_equal(history["Volume"].to_numpy(), expected["Volume"].to_numpy())
+        assert history.index.equals(expected.index)
+
+
+def test_async_honours_start_per_symbol(recorded):
+    starts = {"SPY": "2020-06-01", "^GSPC": "2020-01-01"}
+    with RecordedCandleServer(recorded) as server:
+        histories = asyncio.run(fetch_histories_async(starts, start=starts, end="2020-09-01", base_url=server.base_url))
+    assert histories["SPY"].index[0] >= pd.Timestamp("2020-06-01")
+    assert histories["^GSPC"].index[0] == recorded["^GSPC"].index[0]
+    assert all(history.index[-1] < pd.Timestamp("2020-09-01") for history in histories.values())
+
+
+def test_retries_failed_requests(recorded):
+    with RecordedCandleServer(recorded, fail_every=2) as server:
+        histories = fetch_histories(SYMBOLS, start="2019-01-01", base_url=server.base_url, max_retries=5, backoff=0.01, requests_per_second=0)
+    assert list(histories) == SYMBOLS
+    # Every second request failed with 503 and was retried.
+    assert server.requests > len(SYMBOLS)
+
+
+def test_gives_up_after_max_retries(recorded):
+    with RecordedCandleServer(recorded, fail_every=1) as server:
+        with pytest.raises(FetchError, match="gave up after 2 attempts"):
+            fetch_histories(["SPY"], start="2019-01-01", base_url=server.base_url, max_retries=1, backoff=0.01)
+    assert server.requests == 2
+
+
+def test_skips_unknown_symbols(recorded, capsys):
+    with RecordedCandleServer(recorded) as server:
+        histories = fetch_histories(["SPY", "NOPE", "^GSPC"], start="2019-01-01", base_url=server.base_url, errors="skip")
+        with pytest.raises(FetchError, match="NOPE"):
+            fetch_histories(["SPY", "NOPE"], start="2019-01-01", base_url=server.base_url)
+    assert list(histories) == ["SPY", "^GSPC"]
+    assert "Skipping NOPE" in capsys.readouterr().out
+
+
+def test_rate_limiter_spaces_requests():
+    async def acquire_all(limiter: RateLimiter, n: int) -> list[float]:
+        stamps = []
+        for _ in range(n):
+            await limiter.acquire()
+            stamps.append(time.monotonic())
+        return stamps
+
+    rate, burst = 20.0, 2
+    stamps = asyncio.run(acquire_all(RateLimiter(rate, burst=burst), 8))
+    # The burst goes out at once, then one request per 1 / rate seconds.
+    assert stamps[burst - 1] - stamps[0] < 0.5 / rate
+    assert np.all(np.diff(stamps[burst - 1:]) >= 0.9 / rate)
+    assert stamps[-1] - stamps[0] >= (8 - burst) / rate * 0.95
+
+
+def test_schema_matches_fetch_history(recorded):
+    # fetch_history (yf.download with auto_adjust=True) returns this layout.
+    with RecordedCandleServer(recorded) as server:
+        history = fetch_histories(["^GSPC"], start="2019-01-01", base_url=server.base_url)["^GSPC"]
+    assert list(history.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert history.columns.name == "Price"
+    assert history.dtypes.to_dict() == {"Open": np.float64, "High": np.float64, "Low": np.float64, "Close": np.float64, "Volume": np.int64}
+    assert isinstance(history.index, pd.DatetimeIndex)
+    assert history.index.name == "Date"
+    assert history.index.tz is None
+    # yfinance builds its index with the same pd.to_datetime(..., unit="s") call.
+    assert history.index.dtype == pd.to_datetime([0], unit="s").dtype
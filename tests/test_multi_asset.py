@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from multi_asset import CorrelatedUniverse
+
+
+@dataclass
+class Regime:
+    # The notebook's Regime fields.
+    length: int
+    mu: float
+    sigma: float
+    df: int = 5
+    shock_probability: float = 0.0
+    shock_scale: float = 0.0
+
+
+CORRELATION = np.array([[1.0, 0.6, 0.2], [0.6, 1.0, 0.4], [0.2, 0.4, 1.0]])
+
+
+def test_keyed_paths_do_not_depend_on_chunking():
+    universe = CorrelatedUniverse(CORRELATION)
+    regimes = [Regime(30, 0.0, 0.01), Regime(20, -0.01, 0.03, df=3, shock_probability=0.1, shock_scale=0.1)]
+    whole = universe.sample(regimes, 10, experiment="basket")
+    chunked = universe.sample(regimes, 10, chunk_paths=3, experiment="basket")
+    np.testing.assert_array_equal(chunked, whole)
+    np.testing.assert_array_equal(universe.sample(regimes, [7], experiment="basket")[0], whole[7])
+    assert whole.shape == (10, 50, 3)
+
+
+def test_returns_have_the_target_correlation_and_common_jumps():
+    universe = CorrelatedUniverse(CORRELATION, jump_beta=[1.0, 0.5, 0.0])
+    calm = universe.sample([Regime(20_000, 0.0, 0.01, df=8)], 1, generator=np.random.default_rng(0))[0]
+    np.testing.assert_allclose(np.corrcoef(calm.T), CORRELATION, atol=0.03)
+    np.testing.assert_allclose(calm.std(axis=0), 0.01 * np.sqrt(8 / 6), rtol=0.05)
+
+    # Without diffusion, returns are the shared jump scaled by each asset's beta.
+    jumps = universe.sample([Regime(2_000, 0.0, 0.0, shock_probability=0.05, shock_scale=0.1)], 1, generator=np.random.default_rng(1))[0]
+    assert (jumps[:, 0] < 0).any()
+    np.testing.assert_allclose(jumps[:, 1], 0.5 * jumps[:, 0])
+    assert (jumps[:, 2] == 0).all()
+
+
+def test_indefinite_correlation_is_repaired_and_bad_shapes_rejected():
+    indefinite = np.array([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]])
+    factor = CorrelatedUniverse(indefinite).factor
+    repaired = factor @ factor.T
+    np.testing.assert_allclose(np.diag(repaired), 1.0)
+    assert np.linalg.eigvalsh(repaired).min() > 0
+    with pytest.raises(ValueError):
+        CorrelatedUniverse(np.ones((2, 3)))
+    with pytest.raises(ValueError):
+        CorrelatedUniverse(np.array([[1.0, 0.5], [0.4, 1.0]]))
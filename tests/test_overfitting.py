@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from overfitting import sma_sweep_returns
+from test_portfolio_backtest import notebook_function
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_sweep_columns_match_run_sma_crossover(seed):
+    run_sma_crossover = notebook_function("run_sma_crossover")
+    generator = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + generator.normal(0.0003, 0.015, 1200))
+    sweep, configs = sma_sweep_returns(prices, [5, 10], [20, 40, 80], slippage_bps=7)
+    longest = configs["long_window"].max()
+    assert sweep.shape == (len(prices) - longest + 1, configs.height)
+    for config in configs.iter_rows(named=True):
+        single = run_sma_crossover(prices, config["short_window"], config["long_window"], slippage_bps=7)
+        expected = single["strategy_return"].to_numpy()[longest - config["long_window"]:]
+        np.testing.assert_allclose(sweep[:, config["config"]], expected, atol=1e-12)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from path_rng import draw_paths, experiment_key, path_generator
+
+
+def sampler(generator: np.random.Generator) -> np.ndarray:
+    # Variable raw-draw consumption per variate, like the notebook's samplers.
+    return np.concatenate([generator.standard_t(3, 5), generator.normal(size=3)])
+
+
+def test_a_block_matches_the_same_rows_of_a_full_run():
+    full = draw_paths("stress-basket", 50, sampler)
+    np.testing.assert_array_equal(draw_paths("stress-basket", slice(20, 30), sampler), full[20:30])
+    np.testing.assert_array_equal(draw_paths("stress-basket", [41], sampler)[0], full[41])
+    np.testing.assert_array_equal(path_generator("stress-basket", 7).standard_t(3, 5), full[7, :5])
+
+
+def test_rows_do_not_depend_on_the_other_paths_drawn():
+    alone = draw_paths("stress-basket", [12], sampler)[0]
+    for others in ([3, 12, 40], [12, 999_999], [40, 3, 12]):
+        drawn = draw_paths("stress-basket", others, sampler)
+        np.testing.assert_array_equal(drawn[others.index(12)], alone)
+
+
+def test_experiments_and_paths_are_distinct_streams():
+    first, second = draw_paths("a", 2, sampler)
+    assert not np.array_equal(first, second)
+    assert not np.array_equal(draw_paths("b", [0], sampler)[0], first)
+    assert experiment_key("a") == experiment_key("a") != experiment_key("b")
+    assert experiment_key(5) == 5
+
+
+def test_path_ids_outside_the_key_word_are_rejected():
+    with pytest.raises(ValueError):
+        path_generator("a", -1)
+    with pytest.raises(ValueError):
+        draw_paths("a", slice(3, None), sampler)
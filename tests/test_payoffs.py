@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import payoffs
+from payoffs import AsianOption, BarrierOption, LookbackOption, PointwisePayoff, ProtectivePut, Straddle, VarianceSwap, price_payoffs
+
+
+def test_hand_worked_path():
+    # Levels 1.1, 0.99, 1.188: high 1.188, low 0.99.
+    returns = np.array([0.1, -0.1, 0.2])
+    row = price_payoffs(returns, {
+        "straddle": Straddle(strike=1.0, premium=0.05),
+        "put": ProtectivePut(strike=1.2),
+        "up_and_out": BarrierOption(strike=1.0, barrier=1.15, rebate=0.01),
+        "up_and_in": BarrierOption(strike=1.0, barrier=1.2, knock="in", rebate=0.01),
+        "down_and_in": BarrierOption(strike=1.0, barrier=0.995, direction="down", knock="in"),
+        "lookback_call": LookbackOption(kind="call"),
+        "asian": AsianOption(strike=1.0),
+        "var_swap": VarianceSwap(strike_vol=0.2),
+        "squares": PointwisePayoff(np.square),
+    }).row(0, named=True)
+    assert row["straddle"] == pytest.approx(0.138)
+    assert row["put"] == pytest.approx(0.2)
+    assert row["up_and_out"] == pytest.approx(0.01)
+    assert row["up_and_in"] == pytest.approx(0.01)
+    assert row["down_and_in"] == pytest.approx(0.188)
+    assert row["lookback_call"] == pytest.approx(1.188 - 0.99)
+    assert row["asian"] == pytest.approx((1.1 + 0.99 + 1.188) / 3 - 1)
+    assert row["var_swap"] == pytest.approx(0.06 * 252 / 3 - 0.04)
+    assert row["squares"] == pytest.approx(0.06)
+
+
+def test_chunked_pricing_matches_per_path_and_in_out_parity(monkeypatch):
+    monkeypatch.setattr(payoffs, "PATH_CHUNK", 7)
+    returns = np.random.default_rng(4).normal(0, 0.02, (30, 50))
+    book = {
+        "call": BarrierOption(strike=1.0, barrier=np.inf),
+        "out": BarrierOption(strike=1.0, barrier=1.1),
+        "in": BarrierOption(strike=1.0, barrier=1.1, knock="in"),
+        "lookback": LookbackOption(),
+    }
+    values = price_payoffs(returns, book)
+    for i in range(returns.shape[0]):
+        single = price_payoffs(returns[i], book).row(0, named=True)
+        assert values.row(i, named=True) == pytest.approx(single)
+    np.testing.assert_allclose(values["out"] + values["in"], values["call"])
+    assert (values["lookback"] >= 0).all()
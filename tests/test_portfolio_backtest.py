@@ -0,0 +1,47 @@
+import ast
+import json
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from portfolio_backtest import run_portfolio_sma_crossover
+from streaming_signals import SMACrossoverEngine
+
+NOTEBOOK = Path(__file__).resolve().parents[1] / "convex.ipynb"
+
+
+def notebook_function(name: str):
+    # The single-asset backtester lives in the notebook; compile just that def.
+    for cell in json.loads(NOTEBOOK.read_text())["cells"]:
+        if cell["cell_type"] != "code":
+            continue
+        tree = ast.parse("".join(cell["source"]))
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and node.name == name:
+                namespace = {"np": np, "pl": pl, "SMACrossoverEngine": SMACrossoverEngine}
+                exec(compile(ast.Module([node], type_ignores=[]), str(NOTEBOOK), "exec"), namespace)
+                return namespace[name]
+    raise LookupError(name)
+
+
+@pytest.mark.parametrize("weighting", ["equal", "sleeve"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_one_asset_matches_run_sma_crossover(weighting, seed):
+    run_sma_crossover = notebook_function("run_sma_crossover")
+    generator = np.random.default_rng(seed)
+    prices = 100 * np.cumprod(1 + generator.normal(0.0003, 0.015, 1500))
+    single = run_sma_crossover(prices, 10, 50, slippage_bps=7)
+    portfolio = run_portfolio_sma_crossover(prices[:, None], 10, 50, slippage_bps=7, weighting=weighting)
+    assert portfolio.height == single.height
+    np.testing.assert_allclose(portfolio["turnover"].to_numpy(), single["turnover"].cast(pl.Float64).to_numpy())
+    np.testing.assert_allclose(portfolio["strategy_return"].to_numpy(), single["strategy_return"].to_numpy(), atol=1e-12)
+
+
+def test_opening_bar_is_free_when_long_at_warm_up():
+    # A steady uptrend is long from the first bar with both SMAs.
+    prices = np.linspace(100, 200, 300)
+    portfolio = run_portfolio_sma_crossover(prices[:, None], 10, 50)
+    assert portfolio["n_long"][0] == 1
+    assert portfolio["turnover"].sum() == 0
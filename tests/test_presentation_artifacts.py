@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from presentation_artifacts import PresentationArtifacts, build_artifacts, default_artifacts, load_or_default, presentation_returns
+
+
+def test_artifacts_round_trip_and_load_or_default(tmp_path, monkeypatch):
+    gaussian, fat_tailed = presentation_returns(20, 50)
+    artifacts = build_artifacts(gaussian, fat_tailed, convex=np.exp, concave=np.negative)
+    path = artifacts.save(tmp_path / "artifacts.npz")
+    loaded = load_or_default(path)
+    for name, value in vars(artifacts).items():
+        np.testing.assert_array_equal(getattr(loaded, name), value)
+    assert isinstance(loaded.normal_move, float)
+
+    monkeypatch.setenv("FAT_TAILS_ARTIFACTS", str(tmp_path / "missing.npz"))
+    fallback = load_or_default()
+    assert isinstance(fallback, PresentationArtifacts)
+    assert fallback.gaussian_prices.shape == (300, 253)
+
+
+def test_built_arrays_describe_the_returns():
+    gaussian, fat_tailed = presentation_returns(200, 252)
+    artifacts = default_artifacts(200, 252)
+    np.testing.assert_allclose(artifacts.fat_tailed_prices[:, 1:], np.cumprod(1 + fat_tailed, axis=1))
+    assert (artifacts.gaussian_prices[:, 0] == 1).all()
+    width = np.diff(artifacts.return_grid)[0]
+    # Densities integrate to the share of returns inside the grid.
+    assert artifacts.fat_tailed_density.sum() * width == pytest.approx(0.998, abs=0.002)
+    assert artifacts.gaussian_density.sum() * width == pytest.approx(1.0, abs=0.002)
+    assert artifacts.normal_move == pytest.approx(-gaussian.std())
+    assert artifacts.extreme_move < artifacts.normal_move
+    np.testing.assert_allclose(artifacts.convex_payoff, np.exp(4 * artifacts.move_grid) - 1)
@@ -0,0 +1,90 @@
+import importlib
+import sys
+import textwrap
+
+import numpy as np
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from result_cache import ResultCache
+
+
+@pytest.fixture
+def helper_module(tmp_path, monkeypatch):
+    # A throwaway module whose source the test can edit between calls.
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / "cache_helper.py"
+
+    def write(body: str):
+        path.write_text(textwrap.dedent(body))
+        sys.modules.pop("cache_helper", None)
+        importlib.invalidate_caches()
+        return importlib.import_module("cache_helper")
+
+    yield write
+    sys.modules.pop("cache_helper", None)
+
+
+def test_editing_a_dependency_invalidates(tmp_path, helper_module):
+    cache = ResultCache(tmp_path / "cache")
+    calls = []
+
+    def simulate(n: int) -> np.ndarray:
+        calls.append(n)
+        return helper.scale(np.arange(n))
+
+    helper = helper_module("def scale(x):\n    return x * 2\n")
+    first = cache.memoize(simulate, depends_on=[helper.scale])(3)
+    again = cache.memoize(simulate, depends_on=[helper.scale])(3)
+    np.testing.assert_array_equal(again, first)
+    assert (cache.hits, cache.misses, calls) == (1, 1, [3])
+
+    helper = helper_module("def scale(x):\n    return x * 3\n")
+    edited = cache.memoize(simulate, depends_on=[helper.scale])(3)
+    np.testing.assert_array_equal(edited, [0, 3, 6])
+    assert (cache.hits, cache.misses, calls) == (1, 2, [3, 3])
+
+
+def test_hits_fast_forward_the_generator(tmp_path):
+    cache = ResultCache(tmp_path)
+
+    def draw(generator: np.random.Generator, n: int) -> np.ndarray:
+        return generator.normal(size=n)
+
+    generator = np.random.default_rng(0)
+    cached = cache.memoize(lambda n: draw(generator, n), rng=generator)
+    first, after_miss = cached(4), generator.normal()
+    generator = np.random.default_rng(0)
+    cached = cache.memoize(lambda n: draw(generator, n), rng=generator)
+    second, after_hit = cached(4), generator.normal()
+    assert cache.hits == 1
+    np.testing.assert_array_equal(second, first)
+    assert after_hit == after_miss
+
+
+def test_tuples_of_frames_round_trip(tmp_path):
+    cache = ResultCache(tmp_path)
+    value = (pl.DataFrame({"metric": ["Sharpe"], "value": [1.5]}), {"Return [%]": 12.0})
+    cache.put("key", value)
+    found, stored, _ = cache.get("key")
+    assert found
+    assert_frame_equal(stored[0], value[0])
+    assert stored[1] == value[1]
+
+
+def test_unpicklable_results_are_skipped_with_a_warning(tmp_path):
+    cache = ResultCache(tmp_path)
+    with pytest.warns(UserWarning, match="Not caching"):
+        cache.put("key", lambda: None)
+    assert cache.get("key")[0] is False
+    assert cache.entries() == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(tmp_path, max_entries=2)
+    for key in ["a", "b"]:
+        cache.put(key, np.zeros(1))
+    cache.get("a")
+    cache.put("c", np.zeros(1))
+    assert sorted(folder.name for folder, _, _ in cache.entries()) == ["a", "c"]
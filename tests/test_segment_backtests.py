@@ -0,0 +1,34 @@
+import numpy as np
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from result_cache import ResultCache
+from segment_backtests import STATS_KEYS, run_segments
+from synthetic_bars import synthetic_histories
+
+SEGMENTS = {
+    "SYN0": [("First", "2000-01-01", "2001-12-31"), ("Second", "2002-01-01", "2003-12-31")],
+    "SYN1": [("First", "2000-01-01", "2001-12-31"), ("Too short", "2003-12-01", "2003-12-31")],
+}
+
+
+def histories() -> dict:
+    generator = np.random.default_rng(11)
+    return synthetic_histories(generator.normal(0.0004, 0.015, (2, 1050)), generator=generator)
+
+
+def test_process_pool_matches_inline(tmp_path):
+    frames = histories()
+    inline = run_segments(frames, SEGMENTS, max_workers=0)
+    cache = ResultCache(tmp_path)
+    pooled = run_segments(frames, SEGMENTS, cache=cache, max_workers=2, parallel_min_segments=0)
+    assert list(pooled) == list(inline) == ["SYN0 • First", "SYN0 • Second", "SYN1 • First"]
+    for label, (metrics, stats) in inline.items():
+        assert_frame_equal(pooled[label][0], metrics)
+        assert pooled[label][1] == stats
+        assert set(stats) == set(STATS_KEYS)
+
+    # The pooled results were cached; a rerun is served from the cache.
+    again = run_segments(frames, SEGMENTS, cache=cache, max_workers=2, parallel_min_segments=0)
+    assert cache.hits == 3
+    assert all(isinstance(again[label][0], pl.DataFrame) for label in inline)
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from shock_overlay import concat_overlays, draw_shocks, overlay_equity, overlay_metrics, overlay_prices
+
+
+def test_apply_matches_a_dense_mask():
+    returns = np.random.default_rng(0).normal(0, 0.01, 10_000)
+    overlay = draw_shocks(returns.size, 0.02, 0.25, np.random.default_rng(1))
+    mask = np.zeros(returns.size, dtype=bool)
+    mask[overlay.indices] = True
+    dense = np.zeros(returns.size)
+    dense[mask] = overlay.magnitudes
+    np.testing.assert_array_equal(overlay.apply(returns), returns - dense)
+    assert np.all(np.diff(overlay.indices) > 0)
+    assert overlay.nbytes == 16 * overlay.indices.size
+
+
+def test_arrivals_have_the_dense_mask_distribution():
+    # Geometric gaps reproduce independent per-bar shocks: the count is
+    # binomial and hits are uniform over the series.
+    overlay = draw_shocks(1_000_000, 0.01, 0.25, np.random.default_rng(2))
+    assert overlay.indices.size == pytest.approx(10_000, abs=4 * math.sqrt(10_000))
+    assert overlay.indices.min() >= 0 and overlay.indices.max() < 1_000_000
+    halves = np.bincount(overlay.indices // 500_000)
+    assert abs(halves[0] - halves[1]) < 4 * math.sqrt(overlay.indices.size)
+    assert draw_shocks(100, 0.0, 0.25, np.random.default_rng(3)).indices.size == 0
+
+
+def test_streaming_passes_match_the_dense_series():
+    returns = np.random.default_rng(4).normal(0.0003, 0.01, 5_000)
+    overlay = draw_shocks(returns.size, 0.01, 0.2, np.random.default_rng(5))
+    shocked = overlay.apply(returns)
+    prices = overlay_prices(returns, overlay, block_size=333)
+    np.testing.assert_allclose(prices, np.insert(100 * np.cumprod(1 + shocked), 0, 100))
+    np.testing.assert_allclose(overlay_equity(returns, overlay, block_size=333).to_numpy(), np.cumprod(1 + shocked))
+
+    metrics = dict(overlay_metrics(returns, overlay, "x", block_size=333).select("metric", "value").iter_rows())
+    equity = np.cumprod(1 + shocked)
+    assert metrics["Total return"] == pytest.approx(equity[-1] - 1, rel=1e-9)
+    assert metrics["Annualized vol"] == pytest.approx(math.sqrt(252) * shocked.std(ddof=1), rel=1e-9)
+    assert metrics["Max drawdown"] == pytest.approx((equity / np.maximum.accumulate(equity) - 1).min(), rel=1e-9)
+    assert metrics["Hit rate"] == pytest.approx((shocked > 0).mean())
+
+
+def test_merged_scaled_and_concatenated_overlays():
+    generator = np.random.default_rng(6)
+    first, second = (draw_shocks(1_000, 0.05, 0.1, generator) for _ in range(2))
+    zeros = np.zeros(1_000)
+    np.testing.assert_allclose(first.merged(second).apply(zeros), first.apply(zeros) + second.apply(zeros))
+    np.testing.assert_allclose(first.scaled(2.0).apply(zeros), 2 * first.apply(zeros))
+    joined = concat_overlays([first, second])
+    np.testing.assert_array_equal(joined.apply(np.zeros(2_000)), np.concatenate([first.apply(zeros), second.apply(zeros)]))
+    with pytest.raises(ValueError):
+        first.apply(np.zeros(10))
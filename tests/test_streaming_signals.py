@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from streaming_signals import SMACrossoverEngine
+
+
+def random_walk(seed: int, n: int = 400) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + generator.normal(0.0, 0.02, n))
+
+
+def per_bar(prices: np.ndarray, engine: SMACrossoverEngine) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    events, short, long = [], [], []
+    for price in prices:
+        events.append(engine.update(price))
+        short.append(engine.sma_short)
+        long.append(engine.sma_long)
+    return np.array(events), np.array(short), np.array(long)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_update_matches_update_many(seed):
+    prices = random_walk(seed)
+    events, short, long = per_bar(prices, SMACrossoverEngine(10, 60))
+    batch = SMACrossoverEngine(10, 60).update_many(prices)
+    np.testing.assert_allclose(batch.sma_short, short, rtol=1e-12)
+    np.testing.assert_allclose(batch.sma_long, long, rtol=1e-12)
+    np.testing.assert_array_equal(batch.events, events)
+    assert events.any()
+
+
+@pytest.mark.parametrize("cuts", [[37], [3, 9, 37, 59], [5, 60, 61, 200]])
+def test_batches_split_during_warm_up_match_one_batch(cuts):
+    prices = random_walk(3)
+    whole = SMACrossoverEngine(10, 60).update_many(prices)
+    engine = SMACrossoverEngine(10, 60)
+    parts = [engine.update_many(chunk) for chunk in np.split(prices, cuts)]
+    np.testing.assert_allclose(np.concatenate([p.sma_short for p in parts]), whole.sma_short, rtol=1e-12)
+    np.testing.assert_allclose(np.concatenate([p.sma_long for p in parts]), whole.sma_long, rtol=1e-12)
+    np.testing.assert_array_equal(np.concatenate([p.events for p in parts]), whole.events)
+
+
+@pytest.mark.parametrize("at", [5, 50, 60, 150])
+def test_restored_snapshot_continues_like_the_original(at):
+    prices = random_walk(4)
+    engine = SMACrossoverEngine(10, 60)
+    per_bar(prices[:at], engine)
+    restored = SMACrossoverEngine.restore(engine.snapshot())
+    assert restored.snapshot() == engine.snapshot()
+    expected = per_bar(prices[at:], engine)
+    resumed = per_bar(prices[at:], restored)
+    for got, want in zip(resumed, expected):
+        np.testing.assert_allclose(got, want, rtol=1e-12)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from market_data import OHLCV
+from synthetic_bars import _ewma, synthetic_histories, synthetic_ohlcv
+
+
+def test_bars_do_not_depend_on_later_returns():
+    generator = np.random.default_rng(1)
+    returns = generator.normal(0, 0.01, (3, 200))
+    shocked = returns.copy()
+    shocked[:, 150:] *= 10
+    before = synthetic_ohlcv(returns, generator=np.random.default_rng(2))
+    after = synthetic_ohlcv(shocked, generator=np.random.default_rng(2))
+    for column in OHLCV:
+        np.testing.assert_array_equal(before[column][:, :150], after[column][:, :150])
+
+
+def test_ewma_starts_at_the_first_observation():
+    values = np.array([[4.0, 4.0, 1.0], [2.0, 0.0, 0.0]])
+    alpha = 2 / (3 + 1)
+    np.testing.assert_allclose(_ewma(values, 3), [[4.0, 4.0, 4 + alpha * (1 - 4)], [2.0, 2 * (1 - alpha), 2 * (1 - alpha) ** 2]])
+
+
+def test_closes_follow_the_returns_and_bars_are_consistent():
+    returns = np.random.default_rng(3).standard_t(3, (4, 300)) * 0.02
+    bars = synthetic_ohlcv(returns, start_price=50.0, generator=np.random.default_rng(4))
+    np.testing.assert_allclose(bars["Close"], 50.0 * np.cumprod(1 + returns, axis=1), rtol=1e-10)
+    assert (bars["High"] >= np.maximum(bars["Open"], bars["Close"])).all()
+    assert (bars["Low"] <= np.minimum(bars["Open"], bars["Close"])).all()
+    assert (bars["Low"] > 0).all() and (bars["Volume"] > 0).all()
+
+
+def test_histories_match_fetch_histories_layout():
+    returns = np.random.default_rng(5).normal(0, 0.01, (2, 30))
+    frames = synthetic_histories(returns, names=["AAA", "BBB"], start="2024-01-01", generator=np.random.default_rng(6))
+    assert list(frames) == ["AAA", "BBB"]
+    for frame in frames.values():
+        assert list(frame.columns) == list(OHLCV)
+        assert len(frame) == 30 and frame.index.name == "Date" and frame.index.is_monotonic_increasing
+    with pytest.raises(ValueError):
+        synthetic_histories(returns, names=["AAA"])
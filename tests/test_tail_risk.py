@@ -0,0 +1,42 @@
+import math
+
+import numpy as np
+import polars as pl
+import pytest
+
+from tail_risk import rolling_var_es, tail_metrics
+
+
+def brute_force(returns: np.ndarray, window: int, level: float) -> tuple[np.ndarray, np.ndarray]:
+    k = max(math.ceil(window * (1 - level) - 1e-9), 1)
+    var = np.full(returns.shape, np.nan)
+    es = np.full(returns.shape, np.nan)
+    for t in range(window - 1, returns.shape[1]):
+        worst = np.sort(returns[:, t - window + 1:t + 1], axis=1)[:, :k]
+        var[:, t] = -worst[:, -1]
+        es[:, t] = -worst.mean(axis=1)
+    return var, es
+
+
+@pytest.mark.parametrize("rounded", [False, True])
+def test_rolling_var_es_matches_sorting_every_window(rounded):
+    generator = np.random.default_rng(8)
+    returns = 0.01 * generator.standard_t(3, (5, 600))
+    if rounded:
+        # Ties at the k-th worst value exercise the merge and rebuild paths.
+        returns = np.round(returns, 2)
+    result = rolling_var_es(returns, window=60, levels=(0.9, 0.95, 0.99))
+    for level, name in [(0.9, "90%"), (0.95, "95%"), (0.99, "99%")]:
+        var, es = brute_force(returns, 60, level)
+        np.testing.assert_allclose(result[f"VaR {name}"], var, rtol=1e-12)
+        np.testing.assert_allclose(result[f"ES {name}"], es, rtol=1e-12)
+
+
+def test_series_input_and_tail_metrics_agree_on_the_full_window():
+    returns = np.random.default_rng(9).normal(0, 0.01, 250)
+    rolling = rolling_var_es(returns, window=250)
+    assert rolling["VaR 95%"].shape == returns.shape
+    assert np.isnan(rolling["VaR 95%"][:-1]).all()
+    full = dict(tail_metrics(pl.Series(returns), "x").select("metric", "value").iter_rows())
+    for name in ["VaR 95%", "ES 95%", "VaR 99%", "ES 99%"]:
+        assert rolling[name][-1] == pytest.approx(full[name], rel=1e-12)
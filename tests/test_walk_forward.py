@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from walk_forward import walk_forward
+
+SHORT = [3, 5, 8]
+LONG = [10, 20]
+FEE_BPS = 10.0
+
+
+def direct_sharpe(prices: np.ndarray, short: int, long: int, start: int, stop: int) -> float:
+    # One config's P&L over bars [start, stop) after the longest warm-up,
+    # recomputed bar by bar; Sharpe as in strategy_metrics.
+    close = pd.Series(prices)
+    signal = (close.rolling(short).mean() > close.rolling(long).mean()).astype(float).to_numpy()
+    fee = FEE_BPS / 10_000
+    pnl = [signal[t - 1] * (prices[t] / prices[t - 1] - 1) - abs(signal[t] - signal[t - 1]) * fee for t in range(1, len(prices))]
+    window = np.array([0.0] + pnl)[max(LONG) - 1:][start:stop]
+    ann_return = np.prod(1 + window) ** (252 / window.size) - 1
+    ann_vol = np.sqrt(252) * window.std(ddof=1)
+    return ann_return / ann_vol if ann_vol > 0 else np.nan
+
+
+@pytest.mark.parametrize("anchored", [False, True])
+def test_refit_sharpes_match_direct_recomputation(anchored):
+    generator = np.random.default_rng(5)
+    prices = 100 * np.cumprod(1 + generator.normal(0.0002, 0.015, 300))
+    result = walk_forward(prices, SHORT, LONG, train_bars=60, test_bars=25, slippage_bps=FEE_BPS, anchored=anchored)
+    offset = max(LONG) - 1
+    assert result.refits.height == len(range(60, len(prices) - offset, 25))
+    for refit in result.refits.iter_rows(named=True):
+        start, stop = refit["train_start"] - offset, refit["train_stop"] - offset
+        assert stop - start == (stop if anchored else 60)
+        scores = {(s, l): direct_sharpe(prices, s, l, start, stop) for s in SHORT for l in LONG if s < l}
+        best = max(scores, key=lambda pair: np.nan_to_num(scores[pair], nan=-np.inf))
+        assert (refit["short_window"], refit["long_window"]) == best
+        assert refit["train_sharpe"] == pytest.approx(scores[best], rel=1e-9)
+
+
+def test_every_position_change_is_charged_including_the_final_exit():
+    # A steady uptrend is long throughout: one entry and the final exit.
+    prices = np.linspace(100, 200, 220)
+    returns = walk_forward(prices, SHORT, LONG, train_bars=60, test_bars=25, slippage_bps=FEE_BPS).returns
+    position = returns["position"].to_numpy()
+    assert position[-1] == 1
+    assert returns["turnover"][-1] == 1
+    assert returns["turnover"].sum() == 2
+    assert returns["turnover"].sum() == position[0] + np.abs(np.diff(position)).sum() + position[-1]
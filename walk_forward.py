@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from overfitting import SPLIT_CHUNK, _SegmentSharpe, sma_sweep_signals
+
+
+@dataclass
+class WalkForwardResult:
+    # `returns`: one row per out-of-sample bar with the config in force, the
+    # position held over the bar and the strategy return (feeds straight
+    # into strategy_metrics / equity_curve). `refits`: one row per re-fit
+    # with its training range and the winning config.
+    returns: pl.DataFrame
+    refits: pl.DataFrame
+
+
+def walk_forward(
+    prices,
+    short_windows: Iterable[int],
+    long_windows: Iterable[int],
+    train_bars: int = 504,
+    test_bars: int = 21,
+    slippage_bps: float = 5.0,
+    anchored: bool = False,
+    periods_per_year: int = 252,
+) -> WalkForwardResult:
+    # Rolling walk-forward for the SMA crossover: every test_bars bars,
+    # pick the (short, long) pair with the best Sharpe over the previous
+    # train_bars bars (all bars so far if anchored) and trade it until the
+    # next re-fit. Signals for the whole grid are computed once over the
+    # full history and every training window's Sharpe is read off
+    # cumulative sums of the per-config P&L, so a re-fit costs O(configs)
+    # however long the window; test_bars=1 re-fits daily.
+    #
+    # Timing follows run_sma_crossover: the position over bar t is the
+    # chosen config's signal at t - 1, and turnover is charged on the bar
+    # whose close it trades at, including switches between configs. The
+    # book is flattened at the last bar's close, so an open position pays
+    # its exit like every earlier one.
+    # `prices` is an array or a pd.Series; a DatetimeIndex adds a date column.
+    index = prices.index if isinstance(prices, pd.Series) and isinstance(prices.index, pd.DatetimeIndex) else None
+    prices = np.asarray(prices, dtype=float)
+    signals, configs = sma_sweep_signals(prices, short_windows, long_windows)
+    warm_up = int(configs["long_window"].max()) - 1
+    fee = slippage_bps / 10_000
+
+    returns = np.zeros(prices.shape)
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    pnl = np.zeros(signals.shape)
+    pnl[1:] = signals[:-1] * returns[1:, None] - np.abs(np.diff(signals, axis=0)) * fee
+    # Training windows only see bars after every config's warm-up.
+    pnl, signals, returns = pnl[warm_up:], signals[warm_up:], returns[warm_up:]
+    n_bars = pnl.shape[0]
+    if n_bars <= train_bars:
+        raise ValueError(f"Need more than train_bars={train_bars} bars after the {warm_up}-bar warm-up, got {n_bars}")
+
+    boundaries = np.arange(train_bars, n_bars, test_bars)
+    starts = np.zeros_like(boundaries) if anchored else boundaries - train_bars
+    sharpe = _SegmentSharpe(pnl, periods_per_year)
+    chosen = np.empty(boundaries.size, dtype=np.int64)
+    train_sharpe = np.empty(boundaries.size)
+    for lo in range(0, boundaries.size, SPLIT_CHUNK):
+        bounds = np.stack([starts[lo:lo + SPLIT_CHUNK], boundaries[lo:lo + SPLIT_CHUNK]], axis=1)[:, None, :]
+        scores = np.nan_to_num(sharpe(bounds), nan=-np.inf)
+        chosen[lo:lo + len(bounds)] = scores.argmax(axis=1)
+        train_sharpe[lo:lo + len(bounds)] = scores.max(axis=1)
+
+    # Config in force on each out-of-sample bar, its position, and the
+    # position it trades into at that bar's close (the next bar's position,
+    # flat after the last bar).
+    bars = np.arange(boundaries[0], n_bars)
+    config = np.repeat(chosen, np.diff(np.append(boundaries, n_bars)))
+    position = signals[bars - 1, config].astype(float)
+    following = np.append(position[1:], 0.0)
+    turnover = np.abs(following - position)
+    # Entering the first position happens at the close before the test span.
+    turnover[0] += position[0]
+    strategy_return = position * returns[bars] - turnover * fee
+
+    picked = configs[config]
+    frame = pl.DataFrame({
+        "bar": bars + warm_up,
+        "config": config,
+        "short_window": picked["short_window"],
+        "long_window": picked["long_window"],
+        "position": position,
+        "turnover": turnover,
+        "strategy_return": strategy_return,
+    })
+    winners = configs[chosen]
+    refits = pl.DataFrame({
+        "bar": boundaries + warm_up,
+        "train_start": starts + warm_up,
+        "train_stop": boundaries + warm_up,
+        "config": chosen,
+        "short_window": winners["short_window"],
+        "long_window": winners["long_window"],
+        "train_sharpe": np.where(np.isfinite(train_sharpe), train_sharpe, np.nan),
+    })
+    if index is not None:
+        dates = index.to_numpy().astype("datetime64[ns]")
+        frame = frame.insert_column(0, pl.Series("date", dates[frame["bar"].to_numpy()]))
+        refits = refits.insert_column(0, pl.Series("date", dates[refits["bar"].to_numpy()]))
+    return WalkForwardResult(frame, refits)